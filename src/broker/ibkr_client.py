@@ -4,12 +4,14 @@ This module provides a small wrapper around :class:`ib_async.IB` with
 exponential-backoff ``connect``/``disconnect`` helpers that raise
 ``IBKRError`` after repeated failures.  A ``snapshot`` method is also provided
 to fetch the current account state in a simplified dictionary form.
+:class:`SharedIBKRClient` lets several phases of a run reuse one session.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass
 from types import TracebackType
 from typing import Any, Awaitable, Callable, Dict, List, cast
 
@@ -63,8 +65,14 @@ class IBKRClient:
         await self.disconnect(self._host, self._port, self._client_id)
 
     async def connect(self, host: str, port: int, client_id: int) -> None:
-        """Connect to TWS/Gateway with exponential backoff."""
+        """Connect to TWS/Gateway with exponential backoff.
 
+        Returns immediately when the session is already connected, so repeated
+        calls do not pay for another handshake.
+        """
+
+        if self._ib.isConnected():
+            return
         await retry_async(
             lambda: self._ib.connectAsync(host, port, clientId=client_id),
             retries=3,
@@ -107,9 +115,12 @@ class IBKRClient:
                 await progress("received positions")
             positions = [p for p in positions if p.account == account_id]
 
-            # Request portfolio updates which include market prices/values
+            # Request portfolio updates which include market prices/values.
+            # Subscribing for this account refreshes ``portfolio()`` even when
+            # an earlier snapshot on the same session ended its subscription.
             if progress is not None:
                 await progress("requesting account updates")
+            await self._ib.reqAccountUpdatesAsync(account_id)
             portfolio_items: List[Any] = self._ib.portfolio()
             if progress is not None:
                 await progress("received account updates")
@@ -133,7 +144,7 @@ class IBKRClient:
 
                 pos: Dict[str, Any] = {
                     "account": p.account,
-                    "symbol": getattr(p.contract, "symbol", ""),
+                    "symbol": symbol,
                     "position": p.position,
                     "avg_cost": p.avgCost,
                 }
@@ -190,10 +201,103 @@ class IBKRClient:
                 cash_usd,
                 net_liq_usd,
             )
-            return asdict(snapshot)
+            # Shallow copy: ``asdict`` would deep-copy every position dict
+            # built above for no benefit.
+            return dict(vars(snapshot))
 
         except IBKRError:
             raise
         except Exception as exc:  # pragma: no cover - snapshot errors
             log.exception("Snapshot for %s failed", account_id)
             raise IBKRError(f"snapshot for {account_id} failed: {exc}") from exc
+
+
+class SharedIBKRClient:
+    """Keep one IBKR session open across several connect/disconnect pairs.
+
+    Wraps a client (normally :class:`IBKRClient`) so that planning and order
+    submission for an account share a single connection.  ``connect`` only
+    connects the first time (or when the parameters change), ``disconnect``
+    is a no-op and :meth:`close` performs the real disconnect.  Snapshots are
+    serialized because the session only tracks one of them at a time.  Clients that
+    only implement the async context manager protocol are entered and exited
+    instead.  Any other attribute is forwarded to the wrapped client.
+    """
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+        self._lock = asyncio.Lock()
+        self._snapshot_lock = asyncio.Lock()
+        self._params: tuple[str, int, int] | None = None
+        # Set by callers that use the async context manager protocol.
+        self._host: str | None = None
+        self._port: int | None = None
+        self._client_id: int | None = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    async def __aenter__(self) -> "SharedIBKRClient":
+        if self._host is None or self._port is None or self._client_id is None:
+            raise IBKRError("Connection parameters not set")
+        await self.connect(self._host, self._port, self._client_id)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+    async def connect(self, host: str, port: int, client_id: int) -> None:
+        """Connect unless already connected with the same parameters."""
+
+        params = (host, port, client_id)
+        async with self._lock:
+            if self._params == params:
+                return
+            if self._params is not None:
+                await self._shut(self._params)
+                self._params = None
+            await self._open(params)
+            self._params = params
+
+    async def disconnect(self, host: str, port: int, client_id: int) -> None:
+        """Keep the session open; see :meth:`close`."""
+
+    async def snapshot(self, account_id: str, *args: Any, **kwargs: Any) -> Any:
+        """Return the wrapped client's snapshot, one account at a time.
+
+        ``ib_async`` tracks position and account update requests under fixed
+        keys, so concurrent snapshots on one session would replace each
+        other's pending requests.
+        """
+
+        async with self._snapshot_lock:
+            return await self._client.snapshot(account_id, *args, **kwargs)
+
+    async def close(self) -> None:
+        """Disconnect the wrapped client if it is connected."""
+
+        async with self._lock:
+            if self._params is None:
+                return
+            params, self._params = self._params, None
+            await self._shut(params)
+
+    async def _open(self, params: tuple[str, int, int]) -> None:
+        client = self._client
+        if hasattr(client, "connect"):
+            await client.connect(*params)
+            return
+        client._host, client._port, client._client_id = params
+        await client.__aenter__()
+
+    async def _shut(self, params: tuple[str, int, int]) -> None:
+        client = self._client
+        if hasattr(client, "disconnect"):
+            await client.disconnect(*params)
+        else:
+            await client.__aexit__(None, None, None)
@@ -3,12 +3,13 @@
 # Re-export public pricing utilities for convenient access from ``core``.
 from .drift import Drift, compute_drift
 from .errors import PlanningError
-from .pricing import PricingError, get_price
+from .pricing import PricingError, get_price, get_prices
 
 # Lazy re-export additional utilities for convenient access from ``core``.
 
 __all__ = [
     "get_price",
+    "get_prices",
     "PricingError",
     "PlanningError",
     "compute_drift",
@@ -6,12 +6,11 @@ from collections import defaultdict, deque
 from datetime import datetime
 from pathlib import Path
 from types import SimpleNamespace
-from typing import Any, Mapping, cast
+from typing import Any, Callable, Mapping, cast
 
 from rich import print
 
 from src.broker.errors import IBKRError
-from src.broker.ibkr_client import IBKRClient
 from src.core.errors import PlanningError
 from src.core.planner import Plan
 from src.io import AppConfig, ConfigError, merge_account_overrides
@@ -22,13 +21,28 @@ async def _prompt_user(prompt: str) -> str:
     return await asyncio.to_thread(input, prompt)
 
 
+def _fill_fields(res: Mapping[str, Any]) -> tuple[Any, Any]:
+    """Return the raw fill quantity and price of ``res`` (``None`` if absent).
+
+    Results report these as ``fill_qty``/``fill_price`` or, from older
+    execution paths, ``filled``/``avg_fill_price``.
+    """
+    qty = res.get("fill_qty")
+    if qty is None:
+        qty = res.get("filled")
+    price = res.get("fill_price")
+    if price is None:
+        price = res.get("avg_fill_price")
+    return qty, price
+
+
 async def confirm_per_account(
     plan: Plan,
     args: Any,
     cfg: AppConfig,
     ts_dt: datetime,
     *,
-    client_factory: type[IBKRClient],
+    client_factory: Callable[[], Any],
     submit_batch,
     append_run_summary,
     write_post_trade_report,
@@ -57,6 +71,9 @@ async def confirm_per_account(
     sell_usd = plan["sell_usd"]
     buy_usd_actual = 0.0
     sell_usd_actual = 0.0
+    report_dir = Path(cfg.io.report_dir)
+    ts_iso = ts_dt.isoformat()
+    host, port, client_id = cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id
 
     async def _print(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
         if output_lock is not None:
@@ -68,9 +85,9 @@ async def confirm_per_account(
     async def _append(row: Mapping[str, Any]) -> None:
         if output_lock is not None:
             async with output_lock:
-                append_run_summary(Path(cfg.io.report_dir), ts_dt, row)
+                append_run_summary(report_dir, ts_dt, row)
         else:
-            append_run_summary(Path(cfg.io.report_dir), ts_dt, row)
+            append_run_summary(report_dir, ts_dt, row)
 
     def _build_lookup(
         res_list: list[Mapping[str, Any]],
@@ -95,12 +112,7 @@ async def confirm_per_account(
             res = q.popleft() if q else {}
             if not res:
                 continue
-            qty_any = res.get("fill_qty")
-            if qty_any is None:
-                qty_any = res.get("filled", 0.0)
-            price_any = res.get("fill_price")
-            if price_any is None:
-                price_any = res.get("avg_fill_price", 0.0)
+            qty_any, price_any = _fill_fields(res)
             qty = float(qty_any or 0.0)
             price = float(price_any or 0.0)
             value = qty * price
@@ -119,15 +131,10 @@ async def confirm_per_account(
             res = q.popleft() if q else {}
             if not res:
                 raise IBKRError(f"Missing fill result for {t.symbol} {t.action}")
-            qty_any = res.get("fill_qty")
-            if qty_any is None:
-                qty_any = res.get("filled")
+            qty_any, price_any = _fill_fields(res)
             if qty_any is None:
                 raise IBKRError(f"Missing fill quantity for {t.symbol} {t.action}")
             filled = float(qty_any)
-            price_any = res.get("fill_price")
-            if price_any is None:
-                price_any = res.get("avg_fill_price")
             if price_any is None:
                 prior = prices.get(t.symbol)
                 if prior is None or prior <= 0:
@@ -159,7 +166,7 @@ async def confirm_per_account(
         logging.info("Dry run complete (no orders submitted).")
         await _append(
             {
-                "timestamp_run": ts_dt.isoformat(),
+                "timestamp_run": ts_iso,
                 "account_id": account_id,
                 "planned_orders": planned_orders,
                 "submitted": 0,
@@ -184,7 +191,7 @@ async def confirm_per_account(
         )
         await _append(
             {
-                "timestamp_run": ts_dt.isoformat(),
+                "timestamp_run": ts_iso,
                 "account_id": account_id,
                 "planned_orders": planned_orders,
                 "submitted": 0,
@@ -207,7 +214,7 @@ async def confirm_per_account(
             logging.info("Aborted by user.")
             await _append(
                 {
-                    "timestamp_run": ts_dt.isoformat(),
+                    "timestamp_run": ts_iso,
                     "account_id": account_id,
                     "planned_orders": planned_orders,
                     "submitted": 0,
@@ -227,21 +234,22 @@ async def confirm_per_account(
     logging.info("Submitting batch market orders for %s", account_id)
     client = client_factory()
     if hasattr(client, "__aenter__"):
-        setattr(client, "_host", cfg.ibkr.host)
-        setattr(client, "_port", cfg.ibkr.port)
-        setattr(client, "_client_id", cfg.ibkr.client_id)
+        setattr(client, "_host", host)
+        setattr(client, "_port", port)
+        setattr(client, "_client_id", client_id)
         async with client:
             results = await submit_batch(client, trades, cfg, account_id)
     else:
-        await client.connect(cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id)
+        await client.connect(host, port, client_id)
         try:
             results = await submit_batch(client, trades, cfg, account_id)
         finally:
-            await client.disconnect(cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id)
+            await client.disconnect(host, port, client_id)
 
     for res in results:
-        qty = res.get("fill_qty", res.get("filled", 0))
-        price = res.get("fill_price", res.get("avg_fill_price", 0))
+        qty, price = _fill_fields(res)
+        qty = 0 if qty is None else qty
+        price = 0 if price is None else price
         await _print(
             f"[green]{res.get('symbol')}: {res.get('status')} {qty} @ {price}[/green]"
         )
@@ -255,7 +263,7 @@ async def confirm_per_account(
         post_leverage_actual = (net_liq - cash_after) / net_liq if net_liq else 0.0
         await _append(
             {
-                "timestamp_run": ts_dt.isoformat(),
+                "timestamp_run": ts_iso,
                 "account_id": account_id,
                 "planned_orders": planned_orders,
                 "submitted": len(trades),
@@ -287,7 +295,7 @@ async def confirm_per_account(
         post_leverage_actual = (net_liq - cash_after) / net_liq if net_liq else 0.0
         await _append(
             {
-                "timestamp_run": ts_dt.isoformat(),
+                "timestamp_run": ts_iso,
                 "account_id": account_id,
                 "planned_orders": planned_orders,
                 "submitted": len(results),
@@ -336,26 +344,25 @@ async def confirm_per_account(
         )
         client = client_factory()
         if hasattr(client, "__aenter__"):
-            setattr(client, "_host", cfg.ibkr.host)
-            setattr(client, "_port", cfg.ibkr.port)
-            setattr(client, "_client_id", cfg.ibkr.client_id)
+            setattr(client, "_host", host)
+            setattr(client, "_port", port)
+            setattr(client, "_client_id", client_id)
             async with client:
                 extra_results = await submit_batch(
                     client, extra_trades, cfg, account_id
                 )
         else:
-            await client.connect(cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id)
+            await client.connect(host, port, client_id)
             try:
                 extra_results = await submit_batch(
                     client, extra_trades, cfg, account_id
                 )
             finally:
-                await client.disconnect(
-                    cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id
-                )
+                await client.disconnect(host, port, client_id)
         for res in extra_results:
-            qty = res.get("fill_qty", res.get("filled", 0))
-            price = res.get("fill_price", res.get("avg_fill_price", 0))
+            qty, price = _fill_fields(res)
+            qty = 0 if qty is None else qty
+            price = 0 if price is None else price
             await _print(
                 f"[green]{res.get('symbol')}: {res.get('status')} {qty} @ {price}[/green]"
             )
@@ -375,7 +382,7 @@ async def confirm_per_account(
             post_leverage_actual = (net_liq - cash_after) / net_liq if net_liq else 0.0
             await _append(
                 {
-                    "timestamp_run": ts_dt.isoformat(),
+                    "timestamp_run": ts_iso,
                     "account_id": account_id,
                     "planned_orders": len(current_trades),
                     "submitted": len(current_results),
@@ -407,7 +414,7 @@ async def confirm_per_account(
             post_leverage_actual = (net_liq - cash_after) / net_liq if net_liq else 0.0
             await _append(
                 {
-                    "timestamp_run": ts_dt.isoformat(),
+                    "timestamp_run": ts_iso,
                     "account_id": account_id,
                     "planned_orders": len(current_trades),
                     "submitted": len(current_results),
@@ -436,8 +443,10 @@ async def confirm_per_account(
     sell_usd = sell_usd_actual
     trades = all_trades
     results = all_results
-    post_path = write_post_trade_report(
-        Path(cfg.io.report_dir),
+    # Written on a worker thread so the event loop keeps serving IBKR callbacks.
+    post_path = await asyncio.to_thread(
+        write_post_trade_report,
+        report_dir,
         ts_dt,
         account_id,
         drifts,
@@ -460,7 +469,7 @@ async def confirm_per_account(
     )
     await _append(
         {
-            "timestamp_run": ts_dt.isoformat(),
+            "timestamp_run": ts_iso,
             "account_id": account_id,
             "planned_orders": planned_orders_total,
             "submitted": len(trades),
@@ -482,7 +491,7 @@ async def confirm_global(
     cfg: AppConfig,
     ts_dt: datetime,
     *,
-    client_factory: type[IBKRClient],
+    client_factory: Callable[[], Any],
     submit_batch,
     append_run_summary,
     write_post_trade_report,
@@ -500,6 +509,8 @@ async def confirm_global(
         print(plan["table"])
 
     failures: list[tuple[str, str]] = []
+    report_dir = Path(cfg.io.report_dir)
+    ts_iso = ts_dt.isoformat()
 
     if args.dry_run:
         print("[green]Dry run complete (no orders submitted).[/green]")
@@ -508,10 +519,10 @@ async def confirm_global(
             buy_usd = sum(t.notional for t in plan["trades"] if t.action == "BUY")
             sell_usd = sum(t.notional for t in plan["trades"] if t.action == "SELL")
             append_run_summary(
-                Path(cfg.io.report_dir),
+                report_dir,
                 ts_dt,
                 {
-                    "timestamp_run": ts_dt.isoformat(),
+                    "timestamp_run": ts_iso,
                     "account_id": plan["account_id"],
                     "planned_orders": len(plan["trades"]),
                     "submitted": 0,
@@ -538,10 +549,10 @@ async def confirm_global(
             buy_usd = sum(t.notional for t in plan["trades"] if t.action == "BUY")
             sell_usd = sum(t.notional for t in plan["trades"] if t.action == "SELL")
             append_run_summary(
-                Path(cfg.io.report_dir),
+                report_dir,
                 ts_dt,
                 {
-                    "timestamp_run": ts_dt.isoformat(),
+                    "timestamp_run": ts_iso,
                     "account_id": plan["account_id"],
                     "planned_orders": len(plan["trades"]),
                     "submitted": 0,
@@ -567,10 +578,10 @@ async def confirm_global(
                 buy_usd = sum(t.notional for t in trades if t.action == "BUY")
                 sell_usd = sum(t.notional for t in trades if t.action == "SELL")
                 append_run_summary(
-                    Path(cfg.io.report_dir),
+                    report_dir,
                     ts_dt,
                     {
-                        "timestamp_run": ts_dt.isoformat(),
+                        "timestamp_run": ts_iso,
                         "account_id": plan["account_id"],
                         "planned_orders": len(trades),
                         "submitted": 0,
@@ -593,7 +604,7 @@ async def confirm_global(
         output_lock = asyncio.Lock()
 
         async def start_after_delay(pl: Plan, delay: float) -> None:
-            if delay:
+            if delay > 0:
                 await asyncio.sleep(delay)
             await confirm_per_account(
                 pl,
@@ -676,10 +687,10 @@ async def confirm_global(
             print(f"[red]{exc}[/red]")
             failures.append((account_id, str(exc)))
             failed_accounts.add(account_id)
-        if idx < len(sell_plans) - 1:
+        if pacing_sec > 0 and idx < len(sell_plans) - 1:
             await asyncio.sleep(pacing_sec)
 
-    if buy_plans:
+    if pacing_sec > 0 and buy_plans:
         await asyncio.sleep(pacing_sec)
     for idx, pl in enumerate(buy_plans):
         account_id = pl["account_id"]
@@ -710,6 +721,7 @@ async def confirm_global(
             )
             print(f"[red]{exc}[/red]")
             failures.append((account_id, str(exc)))
-        await asyncio.sleep(pacing_sec)
+        if pacing_sec > 0:
+            await asyncio.sleep(pacing_sec)
 
     return failures
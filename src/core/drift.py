@@ -9,12 +9,13 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Any, Mapping
 
 from src.io.config_loader import ConfigError
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Drift:
     """Represents drift for a single symbol.
 
@@ -193,7 +194,7 @@ def compute_drift(
                         remaining -= abs(d.drift_pct) / 100.0
                         if remaining <= total_band:
                             break
-                    drifts = sorted(selected, key=lambda d: d.symbol)
+                    drifts = sorted(selected, key=attrgetter("symbol"))
                 else:
                     drifts = []
 
@@ -226,8 +227,10 @@ def prioritize_by_drift(account_id: str, drifts: list[Drift], cfg: Any) -> list[
     except AttributeError as exc:  # pragma: no cover - defensive
         raise AttributeError("cfg.rebalance.min_order_usd is required") from exc
 
+    # The filtered list is already a fresh copy, so sort it in place.
     filtered = [d for d in drifts if abs(d.drift_usd) >= min_order]
-    return sorted(filtered, key=lambda d: abs(d.drift_usd), reverse=True)
+    filtered.sort(key=lambda d: abs(d.drift_usd), reverse=True)
+    return filtered
 
 
 __all__ = ["Drift", "compute_drift", "prioritize_by_drift"]
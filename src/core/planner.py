@@ -4,19 +4,20 @@ import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, TypedDict
+from typing import Any, Callable, Collection, TypedDict
 
 from rich import print
 
-from src.broker.ibkr_client import IBKRClient
 from src.core.drift import Drift
 from src.core.errors import PlanningError
 from src.core.preview import render as render_preview
-from src.core.pricing import PricingError, get_price
+from src.core.pricing import PricingError, get_price, get_prices
 from src.core.sizing import SizedTrade
 from src.io import AppConfig
 from src.io.reporting import write_pre_trade_report
 
+_TRADE_ACTIONS = frozenset(("BUY", "SELL"))
+
 
 class Plan(TypedDict, total=False):
     account_id: str
@@ -48,17 +49,33 @@ async def _fetch_price(ib, symbol: str, cfg) -> tuple[str, float]:
     return symbol, price
 
 
+async def _fetch_prices(ib, symbols: Collection[str], cfg) -> dict[str, float]:
+    """Fetch prices for ``symbols`` with batched requests.
+
+    At most ``pricing.max_concurrency`` symbols are requested at once.
+    """
+
+    return await get_prices(
+        ib,
+        symbols,
+        price_source=cfg.pricing.price_source,
+        fallback_to_snapshot=cfg.pricing.fallback_to_snapshot,
+        max_concurrency=cfg.pricing.max_concurrency,
+    )
+
+
 async def plan_account(
     account_id: str,
     portfolios: dict[str, dict[str, float]],
     cfg: AppConfig,
     ts_dt: datetime,
     *,
-    client_factory: type[IBKRClient],
+    client_factory: Callable[[], Any],
     compute_drift,
     prioritize_by_drift,
     size_orders,
     fetch_price=_fetch_price,
+    fetch_prices=None,
     render_preview=render_preview,
     write_pre_trade_report=write_pre_trade_report,
     output_lock: asyncio.Lock | None = None,
@@ -79,6 +96,9 @@ async def plan_account(
     client_factory, compute_drift, prioritize_by_drift, size_orders,
     fetch_price, render_preview, write_pre_trade_report:
         Dependency injection hooks for testing and custom behaviour.
+    fetch_prices:
+        Optional batched price fetcher ``(ib, symbols, cfg) -> prices``.  When
+        given it is used instead of calling ``fetch_price`` once per symbol.
     output_lock:
         Optional ``asyncio.Lock`` used to serialize ``print`` output when planning
         accounts concurrently.
@@ -91,14 +111,15 @@ async def plan_account(
         else:
             print(*args, **kwargs)
 
+    host, port, client_id = cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id
     await _print(
-        f"[blue]Connecting to IBKR at {cfg.ibkr.host}:{cfg.ibkr.port} (client id {cfg.ibkr.client_id}) for account {account_id}[/blue]"
+        f"[blue]Connecting to IBKR at {host}:{port} (client id {client_id}) for account {account_id}[/blue]"
     )
     logging.info(
         "Connecting to IBKR at %s:%s (client id %s) for account %s",
-        cfg.ibkr.host,
-        cfg.ibkr.port,
-        cfg.ibkr.client_id,
+        host,
+        port,
+        client_id,
         account_id,
     )
     client = client_factory()
@@ -111,31 +132,89 @@ async def plan_account(
             progress=lambda msg: _print(f"[blue]{msg}[/blue]"),
         )
 
-        current = {p["symbol"]: float(p["position"]) for p in snapshot["positions"]}
-        current["CASH"] = float(snapshot["cash"])
-
+        # Quantities and usable market prices are read in a single pass; all
+        # snapshot prices share the time the snapshot arrived.
+        current: dict[str, float] = {}
         snapshot_prices: dict[str, float] = {}
         price_timestamps: dict[str, datetime] = {}
+        received_at = datetime.utcnow()
         for pos in snapshot["positions"]:
+            symbol = pos["symbol"]
+            current[symbol] = float(pos["position"])
             price = pos.get("market_price")
-            if price is not None and float(price) > 0:
-                symbol = pos["symbol"]
-                snapshot_prices[symbol] = float(price)
-                price_timestamps[symbol] = datetime.utcnow()
+            if price is not None:
+                price = float(price)
+                if price > 0:
+                    snapshot_prices[symbol] = price
+                    price_timestamps[symbol] = received_at
+        current["CASH"] = float(snapshot["cash"])
 
         net_liq = float(snapshot.get("net_liq", 0.0))
 
         targets: dict[str, float] = {}
+        smurf, badass, gltr = cfg.models.smurf, cfg.models.badass, cfg.models.gltr
         for symbol, weights in portfolios.items():
+            get = weights.get
             combined = (
-                weights.get("smurf", 0.0) * cfg.models.smurf
-                + weights.get("badass", 0.0) * cfg.models.badass
-                + weights.get("gltr", 0.0) * cfg.models.gltr
+                get("smurf", 0.0) * smurf
+                + get("badass", 0.0) * badass
+                + get("gltr", 0.0) * gltr
             )
             if combined != 0:
                 targets[symbol] = combined
 
-        tasks: list[asyncio.Task[Any]] = []
+        async def _load_prices(symbols: Collection[str]) -> dict[str, float]:
+            """Fetch ``symbols`` concurrently, recording each price as it lands.
+
+            A ``fetch_prices`` hook serves all symbols in one call; otherwise
+            ``fetch_price`` runs one task per symbol, at most
+            ``pricing.max_concurrency`` at a time, and outstanding lookups are
+            cancelled as soon as any of them fails.  Progress is reported once
+            per phase by the caller, not per symbol.
+            """
+
+            if not symbols:
+                return {}
+            if fetch_prices is not None:
+                try:
+                    fetched = await fetch_prices(client._ib, symbols, cfg)
+                except PricingError as exc:
+                    await _print(f"[red]{exc}[/red]")
+                    logging.error(str(exc))
+                    raise
+                fetched_at = datetime.utcnow()
+                for symbol, price in fetched.items():
+                    snapshot_prices[symbol] = price
+                    price_timestamps[symbol] = fetched_at
+                return fetched
+
+            fetched = {}
+            limit = asyncio.Semaphore(cfg.pricing.max_concurrency)
+
+            async def bounded(sym: str) -> tuple[str, float]:
+                async with limit:
+                    return await fetch_price(client._ib, sym, cfg)
+
+            tasks = [asyncio.create_task(bounded(sym)) for sym in symbols]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    try:
+                        symbol, price = await task
+                    except PricingError as exc:
+                        await _print(f"[red]{exc}[/red]")
+                        logging.error(str(exc))
+                        raise
+                    fetched[symbol] = price
+                    snapshot_prices[symbol] = price
+                    price_timestamps[symbol] = datetime.utcnow()
+                    logging.debug("Fetched price for %s: %s", symbol, price)
+            except BaseException:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            return fetched
+
         try:
             max_age = getattr(cfg.pricing, "price_max_age_sec", None)
             now = datetime.utcnow()
@@ -149,9 +228,7 @@ async def plan_account(
                     stale_snapshot.add(sym)
                     snapshot_prices.pop(sym, None)
                     price_timestamps.pop(sym, None)
-            missing_current = {
-                sym for sym in current if sym != "CASH" and sym not in snapshot_prices
-            }
+            missing_current = current.keys() - snapshot_prices.keys() - {"CASH"}
             needed_targets = {
                 sym
                 for sym, wt in targets.items()
@@ -166,24 +243,7 @@ async def plan_account(
                 account_id,
                 len(target_symbols),
             )
-            tasks = [
-                asyncio.create_task(fetch_price(client._ib, sym, cfg))
-                for sym in target_symbols
-            ]
-            for idx, task in enumerate(asyncio.as_completed(tasks), 1):
-                try:
-                    symbol, price = await task
-                except PricingError as exc:
-                    await _print(f"[red]{exc}[/red]")
-                    logging.error(str(exc))
-                    for t in tasks:
-                        t.cancel()
-                    await asyncio.gather(*tasks, return_exceptions=True)
-                    raise
-                snapshot_prices[symbol] = price
-                price_timestamps[symbol] = datetime.utcnow()
-                await _print(f"[blue]  ({idx}/{len(target_symbols)}) {symbol}[/blue]")
-            tasks = []
+            await _load_prices(target_symbols)
 
             await _print("[blue]Computing drift[/blue]")
             logging.info("Computing drift for %s", account_id)
@@ -197,7 +257,7 @@ async def plan_account(
             trade_symbols = {
                 d.symbol
                 for d in prioritized
-                if d.symbol != "CASH" and d.action in ("BUY", "SELL")
+                if d.action in _TRADE_ACTIONS and d.symbol != "CASH"
             }
 
             max_age = getattr(cfg.pricing, "price_max_age_sec", None)
@@ -223,27 +283,7 @@ async def plan_account(
                     account_id,
                     len(stale_symbols),
                 )
-                tasks = [
-                    asyncio.create_task(fetch_price(client._ib, sym, cfg))
-                    for sym in stale_symbols
-                ]
-                for idx, task in enumerate(asyncio.as_completed(tasks), 1):
-                    try:
-                        symbol, price = await task
-                    except PricingError as exc:
-                        await _print(f"[red]{exc}[/red]")
-                        logging.error(str(exc))
-                        for t in tasks:
-                            t.cancel()
-                        await asyncio.gather(*tasks, return_exceptions=True)
-                        raise
-                    trade_prices[symbol] = price
-                    snapshot_prices[symbol] = price
-                    price_timestamps[symbol] = datetime.utcnow()
-                    await _print(
-                        f"[blue]  ({idx}/{len(stale_symbols)}) {symbol}[/blue]"
-                    )
-                tasks = []
+                trade_prices.update(await _load_prices(stale_symbols))
             else:
                 await _print("[blue]Reusing existing prices for trade symbols[/blue]")
                 logging.info(
@@ -252,9 +292,6 @@ async def plan_account(
                     len(trade_symbols),
                 )
         except Exception as exc:  # pragma: no cover - defensive
-            for t in tasks:
-                t.cancel()
-            await asyncio.gather(*tasks, return_exceptions=True)
             raise PlanningError(str(exc)) from exc
         return (
             current,
@@ -267,9 +304,9 @@ async def plan_account(
         )
 
     if hasattr(client, "__aenter__"):
-        setattr(client, "_host", cfg.ibkr.host)
-        setattr(client, "_port", cfg.ibkr.port)
-        setattr(client, "_client_id", cfg.ibkr.client_id)
+        setattr(client, "_host", host)
+        setattr(client, "_port", port)
+        setattr(client, "_client_id", client_id)
         async with client:
             (
                 current,
@@ -281,7 +318,7 @@ async def plan_account(
                 targets,
             ) = await _plan_with_client(client)
     else:
-        await client.connect(cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id)
+        await client.connect(host, port, client_id)
         try:
             (
                 current,
@@ -293,7 +330,7 @@ async def plan_account(
                 targets,
             ) = await _plan_with_client(client)
         finally:
-            await client.disconnect(cfg.ibkr.host, cfg.ibkr.port, cfg.ibkr.client_id)
+            await client.disconnect(host, port, client_id)
 
     await _print("[blue]Sizing orders[/blue]")
     logging.info("Sizing orders for %s", account_id)
@@ -312,7 +349,10 @@ async def plan_account(
     buy_usd = sum(t.notional for t in trades if t.action == "BUY")
     sell_usd = sum(t.notional for t in trades if t.action == "SELL")
     combined_prices = {**snapshot_prices, **trade_prices}
-    pre_path = write_pre_trade_report(
+    # Report files are written on a worker thread so the event loop keeps
+    # serving other accounts and IBKR callbacks meanwhile.
+    pre_path = await asyncio.to_thread(
+        write_pre_trade_report,
         Path(cfg.io.report_dir),
         ts_dt,
         account_id,
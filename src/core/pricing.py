@@ -12,20 +12,51 @@ data.  Additionally when ``price_source`` is ``"last"`` and the last price is
 missing or non-finite, the ``"close"`` field is used as a fallback before
 resorting to the snapshot request.  A :class:`PricingError` is raised when no
 price can be determined.
+
+:func:`get_prices` applies the same rules to many symbols at once, qualifying
+all contracts and requesting their tickers in a single batch rather than one
+round trip per symbol.  Contract ids from earlier qualifications are kept in
+:mod:`src.io.contract_cache`, so only symbols not seen recently are qualified.
 """
 
 from __future__ import annotations
 
+import asyncio
 import math
-from typing import Any
+from typing import Any, Iterable
 
 from ib_async.contract import Stock
 
+from src.io import contract_cache
+
 
 class PricingError(Exception):
     """Raised when a price cannot be obtained for a symbol."""
 
 
+def _extract_price(ticker: Any, field: str) -> float | None:
+    """Return a finite, positive price from ``ticker`` using ``field``.
+
+    When ``field`` is ``"last"`` and the value is missing or non-finite, the
+    ``"close"`` field is checked as a secondary source.  ``None`` is returned
+    if no suitable value can be found.
+    """
+
+    if ticker is None:
+        return None
+
+    value = getattr(ticker, field, None)
+    if value is None or not math.isfinite(value) or value <= 0:
+        if field == "last":
+            value = getattr(ticker, "close", None)
+            if value is None or not math.isfinite(value) or value <= 0:
+                return None
+        else:
+            return None
+
+    return float(value)
+
+
 async def get_price(
     ib: Any,
     symbol: str,
@@ -75,39 +106,130 @@ async def get_price(
 
     contract = qualified_contracts[0]
 
-    def _extract_price(tickers: list[Any], field: str) -> float | None:
-        """Return a finite price from ``tickers`` using ``field``.
-
-        When ``field`` is ``"last"`` and the value is missing or non-finite,
-        the ``"close"`` field is checked as a secondary source.  ``None`` is
-        returned if no suitable value can be found.
-        """
-
-        if not tickers:
-            return None
-
-        value = getattr(tickers[0], field, None)
-        if value is None or not math.isfinite(value) or value <= 0:
-            if field == "last":
-                value = getattr(tickers[0], "close", None)
-                if value is None or not math.isfinite(value) or value <= 0:
-                    return None
-            else:
-                return None
-
-        return float(value)
-
     # Initial realtime market data request using the qualified contract
     tickers = await ib.reqTickersAsync(contract)
-    price = _extract_price(tickers, price_source)
+    price = _extract_price(tickers[0] if tickers else None, price_source)
 
     # If no price and snapshot fallback is enabled, try again with the same
     # qualified contract but requesting delayed snapshot data
     if price is None and fallback_to_snapshot:
         tickers = await ib.reqTickersAsync(contract, snapshot=True)
-        price = _extract_price(tickers, price_source)
+        price = _extract_price(tickers[0] if tickers else None, price_source)
 
     if price is None or not math.isfinite(price) or price <= 0:
         raise PricingError(f"Invalid price for {symbol} using {price_source}")
 
     return price
+
+
+async def get_prices(
+    ib: Any,
+    symbols: Iterable[str],
+    *,
+    price_source: str,
+    fallback_to_snapshot: bool,
+    max_concurrency: int | None = None,
+) -> dict[str, float]:
+    """Return prices for ``symbols`` using batched market data requests.
+
+    Contracts whose ``conId`` is cached are used as is; the rest are qualified
+    in one call and added to the cache, and cached ids that no longer yield a
+    price are evicted.  Cache file access runs on a worker thread.  Tickers
+    are then requested in a single call, or in consecutive chunks of at most
+    ``max_concurrency`` contracts when given, and only symbols still lacking a
+    price are retried with ``snapshot=True`` when ``fallback_to_snapshot`` is
+    set.  Field selection follows :func:`get_price`.
+
+    Raises
+    ------
+    PricingError
+        If any contract cannot be qualified or any symbol is left without a
+        valid price.
+    """
+
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return {}
+
+    con_ids = await asyncio.to_thread(contract_cache.load_cache)
+    by_symbol = {
+        symbol: Stock(
+            symbol=symbol, exchange="SMART", currency="USD", conId=con_ids[symbol]
+        )
+        for symbol in symbols
+        if symbol in con_ids
+    }
+    learned: dict[str, int] = {}
+    unknown = [symbol for symbol in symbols if symbol not in by_symbol]
+    if unknown:
+        qualified = await ib.qualifyContractsAsync(
+            *(Stock(symbol=s, exchange="SMART", currency="USD") for s in unknown)
+        )
+        # Results line up with the request.  IB may rewrite the symbol of a
+        # qualified contract (``BRK.B`` -> ``BRK B``), so match by position.
+        # Unqualified or ambiguous contracts come back as ``None`` (or a list
+        # of candidates).
+        for symbol, c in zip(unknown, qualified):
+            if c is None or isinstance(c, list):
+                continue
+            by_symbol[symbol] = c
+            con_id = getattr(c, "conId", 0)
+            if isinstance(con_id, int) and con_id > 0:
+                learned[symbol] = con_id
+    unqualified = [symbol for symbol in symbols if symbol not in by_symbol]
+    if unqualified:
+        if learned:
+            await asyncio.to_thread(contract_cache.update_cache, learned)
+        raise PricingError(f"Could not qualify contract for {unqualified[0]}")
+    contracts = [by_symbol[symbol] for symbol in symbols]
+
+    async def request(batch: list[Any], snapshot: bool = False) -> list[Any]:
+        # At most ``max_concurrency`` market data lines are open at once.
+        size = max_concurrency or len(batch)
+        tickers: list[Any] = []
+        for start in range(0, len(batch), size):
+            chunk = batch[start : start + size]
+            if snapshot:
+                result = list(await ib.reqTickersAsync(*chunk, snapshot=True))
+            else:
+                result = list(await ib.reqTickersAsync(*chunk))
+            # Keep positions aligned with ``batch`` if a chunk comes back short.
+            tickers.extend(result + [None] * (len(chunk) - len(result)))
+        return tickers
+
+    prices: dict[str, float] = {}
+    missing: list[int] = []
+    tickers = await request(contracts)
+    for i, symbol in enumerate(symbols):
+        price = _extract_price(tickers[i] if i < len(tickers) else None, price_source)
+        if price is None:
+            missing.append(i)
+        else:
+            prices[symbol] = price
+
+    if missing and fallback_to_snapshot:
+        tickers = await request([contracts[i] for i in missing], snapshot=True)
+        still_missing = []
+        for j, i in enumerate(missing):
+            ticker = tickers[j] if j < len(tickers) else None
+            price = _extract_price(ticker, price_source)
+            if price is None:
+                still_missing.append(i)
+            else:
+                prices[symbols[i]] = price
+        missing = still_missing
+
+    # Symbols without a price are not cached, and a cached contract id that
+    # no longer yields a price is dropped so the next run qualifies it again.
+    unpriced = {symbols[i] for i in missing}
+    learned = {s: con_id for s, con_id in learned.items() if s not in unpriced}
+    evicted = unpriced & con_ids.keys()
+    if learned or evicted:
+        await asyncio.to_thread(contract_cache.update_cache, learned, evicted)
+
+    if missing:
+        raise PricingError(
+            f"Invalid price for {symbols[missing[0]]} using {price_source}"
+        )
+
+    return prices
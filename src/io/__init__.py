@@ -18,15 +18,10 @@ from .config_loader import (
     Models,
     Pricing,
     Rebalance,
+    clear_config_cache,
     load_config,
     merge_account_overrides,
 )
-from .portfolio_csv import (
-    PortfolioCSVError,
-    load_portfolios,
-    load_portfolios_map,
-    validate_symbols,
-)
 
 __all__ = [
     "AppConfig",
@@ -42,6 +37,7 @@ __all__ = [
     "Pricing",
     "Rebalance",
     "load_config",
+    "clear_config_cache",
     "merge_account_overrides",
     "PortfolioCSVError",
     "load_portfolios",
@@ -55,6 +51,17 @@ __all__ = [
 
 
 def __getattr__(name: str):
+    # The CSV loader pulls in ib_async and reporting sets up file handles, so
+    # both are only imported when one of their names is first requested.
+    if name in {
+        "PortfolioCSVError",
+        "load_portfolios",
+        "load_portfolios_map",
+        "validate_symbols",
+    }:
+        from . import portfolio_csv
+
+        return getattr(portfolio_csv, name)
     if name in {
         "append_run_summary",
         "setup_logging",
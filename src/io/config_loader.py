@@ -1,18 +1,29 @@
 """Configuration loader for IB_Simple.
 
-This module parses ``settings.ini`` files into structured dataclasses.
+This module parses ``settings.ini`` (or ``settings.toml``) files into
+structured dataclasses.
 """
 
 from __future__ import annotations
 
+import copy
 import logging
 from configparser import ConfigParser, NoOptionError, NoSectionError
 from dataclasses import dataclass, field, replace
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, Dict, Mapping
 
+try:
+    import tomllib
+except ModuleNotFoundError:  # pragma: no cover - Python < 3.11
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ModuleNotFoundError:
+        tomllib = None  # type: ignore[assignment]
+
 
 class ConfigError(Exception):
     """Raised when configuration loading or validation fails."""
@@ -76,6 +87,7 @@ class Pricing:
     price_source: str
     fallback_to_snapshot: bool
     price_max_age_sec: float | None = None
+    max_concurrency: int = 8
 
 
 @dataclass
@@ -120,6 +132,7 @@ class Accounts:
     pacing_sec: float = 0.0
     parallel: bool = False
     path: Path | None = None
+    max_in_flight: int = 4
 
 
 @dataclass
@@ -140,6 +153,39 @@ class AppConfig:
 
 TOLERANCE = 0.001
 
+_REQUIRED = object()
+
+# (key, ConfigParser getter, fallback) for options read as a block per section.
+_IBKR_OPTIONS = (
+    ("host", "get", _REQUIRED),
+    ("port", "getint", _REQUIRED),
+    ("client_id", "getint", _REQUIRED),
+    ("read_only", "getboolean", _REQUIRED),
+)
+_REBALANCE_OPTIONS = (
+    ("trigger_mode", "get", _REQUIRED),
+    ("per_holding_band_bps", "getint", _REQUIRED),
+    ("portfolio_total_band_bps", "getint", _REQUIRED),
+    ("min_order_usd", "getint", _REQUIRED),
+    ("cash_buffer_type", "get", "abs"),
+    ("allow_fractional", "getboolean", _REQUIRED),
+    ("max_leverage", "getfloat", _REQUIRED),
+    ("trading_hours", "get", _REQUIRED),
+    ("max_passes", "getint", 1),
+)
+_EXECUTION_OPTIONS = (
+    ("order_type", "get", _REQUIRED),
+    ("algo_preference", "get", _REQUIRED),
+    ("fallback_plain_market", "getboolean", _REQUIRED),
+    ("batch_orders", "getboolean", _REQUIRED),
+    ("commission_report_timeout", "getfloat", 5.0),
+    ("wait_before_fallback", "getfloat", 300.0),
+)
+_IO_OPTIONS = (
+    ("report_dir", "get", _REQUIRED),
+    ("log_level", "get", _REQUIRED),
+)
+
 
 def _load_section(cp: ConfigParser, section: str) -> Dict[str, str]:
     try:
@@ -148,6 +194,61 @@ def _load_section(cp: ConfigParser, section: str) -> Dict[str, str]:
         raise ConfigError(f"Missing section [{section}]") from exc
 
 
+def _read_options(
+    cp: ConfigParser, section: str, options: tuple[tuple[str, str, Any], ...]
+) -> Dict[str, Any]:
+    """Read and convert ``options`` from ``section`` in a single pass."""
+
+    values: Dict[str, Any] = {}
+    try:
+        for key, getter, fallback in options:
+            get = getattr(cp, getter)
+            if fallback is _REQUIRED:
+                values[key] = get(section, key)
+            else:
+                values[key] = get(section, key, fallback=fallback)
+    except (NoSectionError, NoOptionError, ValueError) as exc:
+        raise ConfigError(f"[{section}] {exc}") from exc
+    return values
+
+
+def _toml_value(section: str, key: str, value: Any) -> str:
+    """Render a TOML scalar or array as the equivalent INI string."""
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, list):
+        return ", ".join(_toml_value(section, key, v) for v in value)
+    if isinstance(value, dict):
+        raise ConfigError(f"[{section}] nested tables are not supported: {key}")
+    return str(value)
+
+
+def _read_toml(cp: ConfigParser, path: Path) -> None:
+    """Populate ``cp`` from the TOML file at ``path``.
+
+    Values are converted to the strings ``ConfigParser`` would have read from
+    the INI form, so both formats share the same validation below.
+    """
+
+    if tomllib is None:
+        raise ConfigError("TOML config requires Python 3.11+ or the 'tomli' package")
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise ConfigError(f"Cannot read config: {path}") from exc
+    except tomllib.TOMLDecodeError as exc:
+        raise ConfigError(f"Invalid TOML in {path}: {exc}") from exc
+    sections: Dict[str, Dict[str, str]] = {}
+    for section, table in data.items():
+        if not isinstance(table, dict):
+            raise ConfigError(f"Top-level key outside a table: {section}")
+        sections[section] = {
+            key: _toml_value(section, key, value) for key, value in table.items()
+        }
+    cp.read_dict(sections)
+
+
 def _parse_account_override(items: Mapping[str, str]) -> AccountOverride:
     """Convert raw key/value pairs into an :class:`AccountOverride`."""
 
@@ -228,29 +329,78 @@ def merge_account_overrides(cfg: Any, account_id: str) -> Any:
 
 
 def load_config(path: Path) -> AppConfig:
-    """Load configuration from an INI file."""
+    """Load configuration from an INI file, or a TOML file ending in ``.toml``.
+
+    Parsed configurations are cached per file and reused while its size and
+    modification time are unchanged; each call returns an independent copy,
+    so callers may modify the result.  :func:`clear_config_cache` drops the
+    cache.
+    """
+
+    try:
+        resolved = path.resolve()
+        st = resolved.stat()
+    except OSError:
+        # Let the parser report unreadable files as a ConfigError.
+        return _parse_config(path)
+    return _copy_config(_load_config_cached(resolved, st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: Path, mtime_ns: int, size: int) -> AppConfig:
+    return _parse_config(path)
+
+
+def clear_config_cache() -> None:
+    """Forget configurations cached by :func:`load_config`."""
+
+    _load_config_cached.cache_clear()
+
+
+def _copy_config(cfg: AppConfig) -> AppConfig:
+    """Return a copy of ``cfg`` that shares no mutable state with it.
+
+    Sections only hold scalars, enums and paths apart from the containers
+    copied here, so this is several times cheaper than ``copy.deepcopy``.
+    """
+
+    return replace(
+        cfg,
+        ibkr=copy.copy(cfg.ibkr),
+        models=copy.copy(cfg.models),
+        rebalance=copy.copy(cfg.rebalance),
+        pricing=copy.copy(cfg.pricing),
+        execution=copy.copy(cfg.execution),
+        io=copy.copy(cfg.io),
+        accounts=replace(cfg.accounts, ids=list(cfg.accounts.ids)),
+        account_overrides={
+            account_id: replace(override, extra=dict(override.extra))
+            for account_id, override in cfg.account_overrides.items()
+        },
+        portfolio_paths=dict(cfg.portfolio_paths),
+    )
+
+
+def _parse_config(path: Path) -> AppConfig:
+    """Parse and validate the configuration file at ``path``."""
 
-    cp = ConfigParser()
-    if not cp.read(path):
+    cp = ConfigParser(interpolation=None)
+    if path.suffix.lower() == ".toml":
+        _read_toml(cp, path)
+    elif not cp.read(path):
         raise ConfigError(f"Cannot read config: {path}")
 
     base_dir = path.parent
 
     # [ibkr]
-    try:
-        host = cp.get("ibkr", "host")
-        port = cp.getint("ibkr", "port")
-        client_id = cp.getint("ibkr", "client_id")
-        read_only = cp.getboolean("ibkr", "read_only")
-    except (NoSectionError, NoOptionError, ValueError) as exc:
-        raise ConfigError(f"[ibkr] {exc}") from exc
+    ibkr_values = _read_options(cp, "ibkr", _IBKR_OPTIONS)
     if cp.has_option("ibkr", "account_id"):
         raise ConfigError(
             "[ibkr] account_id is no longer supported; use [accounts] ids"
         )
-    if port <= 0:
+    if ibkr_values["port"] <= 0:
         raise ConfigError("[ibkr] port must be positive")
-    if client_id < 0:
+    if ibkr_values["client_id"] < 0:
         raise ConfigError("[ibkr] client_id must be non-negative")
 
     if not cp.has_section("accounts"):
@@ -293,6 +443,12 @@ def load_config(path: Path) -> AppConfig:
         parallel = cp.getboolean("accounts", "parallel", fallback=False)
     except ValueError as exc:
         raise ConfigError("[accounts] parallel must be a boolean") from exc
+    try:
+        max_in_flight = cp.getint("accounts", "max_in_flight", fallback=4)
+    except ValueError as exc:
+        raise ConfigError("[accounts] max_in_flight must be an integer") from exc
+    if max_in_flight < 1:
+        raise ConfigError("[accounts] max_in_flight must be >= 1")
     raw_accounts_path = cp.get("accounts", "path", fallback=None)
     accounts_path = None
     if raw_accounts_path:
@@ -307,14 +463,10 @@ def load_config(path: Path) -> AppConfig:
         pacing_sec=pacing_sec,
         parallel=parallel,
         path=accounts_path,
+        max_in_flight=max_in_flight,
     )
 
-    ibkr = IBKR(
-        host=host,
-        port=port,
-        client_id=client_id,
-        read_only=read_only,
-    )
+    ibkr = IBKR(**ibkr_values)
 
     account_overrides: Dict[str, AccountOverride] = {}
     portfolio_paths: Dict[str, Path] = {}
@@ -357,20 +509,14 @@ def load_config(path: Path) -> AppConfig:
     models = Models(**weights)  # type: ignore[arg-type]
 
     # [rebalance]
-    try:
-        trigger_mode = cp.get("rebalance", "trigger_mode")
-        per_holding_band_bps = cp.getint("rebalance", "per_holding_band_bps")
-        portfolio_total_band_bps = cp.getint("rebalance", "portfolio_total_band_bps")
-        min_order_usd = cp.getint("rebalance", "min_order_usd")
-        cash_buffer_type = cp.get(
-            "rebalance", "cash_buffer_type", fallback="abs"
-        ).lower()
-        allow_fractional = cp.getboolean("rebalance", "allow_fractional")
-        max_leverage = cp.getfloat("rebalance", "max_leverage")
-        trading_hours = cp.get("rebalance", "trading_hours").strip().lower()
-        max_passes = cp.getint("rebalance", "max_passes", fallback=1)
-    except (NoSectionError, NoOptionError, ValueError) as exc:
-        raise ConfigError(f"[rebalance] {exc}") from exc
+    reb_values = _read_options(cp, "rebalance", _REBALANCE_OPTIONS)
+    per_holding_band_bps = reb_values["per_holding_band_bps"]
+    portfolio_total_band_bps = reb_values["portfolio_total_band_bps"]
+    min_order_usd = reb_values["min_order_usd"]
+    cash_buffer_type = reb_values["cash_buffer_type"].lower()
+    max_leverage = reb_values["max_leverage"]
+    trading_hours = reb_values["trading_hours"].strip().lower()
+    max_passes = reb_values["max_passes"]
     if per_holding_band_bps < 0:
         raise ConfigError("[rebalance] per_holding_band_bps must be >= 0")
     if portfolio_total_band_bps < 0:
@@ -406,14 +552,14 @@ def load_config(path: Path) -> AppConfig:
     if max_passes <= 0:
         raise ConfigError("[rebalance] max_passes must be >= 1")
     rebalance = Rebalance(
-        trigger_mode=trigger_mode,
+        trigger_mode=reb_values["trigger_mode"],
         per_holding_band_bps=per_holding_band_bps,
         portfolio_total_band_bps=portfolio_total_band_bps,
         min_order_usd=min_order_usd,
         cash_buffer_type=cash_buffer_type,
         cash_buffer_pct=cash_buffer_pct,
         cash_buffer_abs=cash_buffer_abs,
-        allow_fractional=allow_fractional,
+        allow_fractional=reb_values["allow_fractional"],
         max_leverage=max_leverage,
         trading_hours=trading_hours,
         max_passes=max_passes,
@@ -425,10 +571,19 @@ def load_config(path: Path) -> AppConfig:
             max_age = cp.getfloat("pricing", "price_max_age_sec")
         except (NoOptionError, ValueError):
             max_age = None
+        try:
+            max_concurrency = cp.getint(
+                "pricing", "max_concurrency", fallback=Pricing.max_concurrency
+            )
+        except ValueError as exc:
+            raise ConfigError("[pricing] max_concurrency must be an integer") from exc
+        if max_concurrency < 1:
+            raise ConfigError("[pricing] max_concurrency must be >= 1")
         pricing = Pricing(
             price_source=cp.get("pricing", "price_source"),
             fallback_to_snapshot=cp.getboolean("pricing", "fallback_to_snapshot"),
             price_max_age_sec=max_age,
+            max_concurrency=max_concurrency,
         )
     except (NoSectionError, NoOptionError, ValueError) as exc:
         raise ConfigError(f"[pricing] {exc}") from exc
@@ -443,31 +598,13 @@ def load_config(path: Path) -> AppConfig:
         raise ConfigError(
             "[execution] adaptive_priority must be 'patient', 'normal', or 'urgent'"
         ) from exc
-    try:
-        execution = Execution(
-            order_type=cp.get("execution", "order_type"),
-            algo_preference=cp.get("execution", "algo_preference"),
-            fallback_plain_market=cp.getboolean("execution", "fallback_plain_market"),
-            batch_orders=cp.getboolean("execution", "batch_orders"),
-            commission_report_timeout=cp.getfloat(
-                "execution", "commission_report_timeout", fallback=5.0
-            ),
-            wait_before_fallback=cp.getfloat(
-                "execution", "wait_before_fallback", fallback=300.0
-            ),
-            adaptive_priority=adaptive_priority,
-        )
-    except (NoSectionError, NoOptionError, ValueError) as exc:
-        raise ConfigError(f"[execution] {exc}") from exc
+    execution = Execution(
+        **_read_options(cp, "execution", _EXECUTION_OPTIONS),
+        adaptive_priority=adaptive_priority,
+    )
 
     # [io]
-    try:
-        io_cfg = IO(
-            report_dir=cp.get("io", "report_dir"),
-            log_level=cp.get("io", "log_level"),
-        )
-    except (NoSectionError, NoOptionError, ValueError) as exc:
-        raise ConfigError(f"[io] {exc}") from exc
+    io_cfg = IO(**_read_options(cp, "io", _IO_OPTIONS))
 
     return AppConfig(
         ibkr=ibkr,
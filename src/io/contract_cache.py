@@ -0,0 +1,82 @@
+"""On-disk cache of IBKR contract ids keyed by symbol.
+
+Qualifying a contract costs a contract-details round trip to IBKR, and a
+listing's ``conId`` rarely changes.  :func:`load_cache` and
+:func:`update_cache` persist ``symbol -> conId`` for the SMART-routed USD stocks
+and ETFs the tool trades so later runs only qualify symbols they have not seen
+recently.  Entries expire after 30 days (``IB_SIMPLE_CONTRACT_TTL`` sets the
+lifetime in seconds; ``0`` disables the cache) so a reused ticker is
+re-qualified eventually, and callers evict entries that stop yielding prices.
+The file is ``contract_ids.json`` in the cache directory described in
+:mod:`src.io.json_cache`; deleting it forces every symbol to be qualified
+again.  Both functions do blocking file I/O.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Iterable, Mapping
+
+from . import json_cache
+
+_CACHE_FILE = "contract_ids.json"
+_TTL_ENV = "IB_SIMPLE_CONTRACT_TTL"
+
+# ``update_cache`` is a read-modify-write that several accounts may run on
+# worker threads at once.
+_update_lock = threading.Lock()
+
+
+def _read_entries() -> dict[str, dict[str, Any]]:
+    entries: dict[str, dict[str, Any]] = {}
+    for symbol, entry in json_cache.load(_CACHE_FILE).items():
+        if not isinstance(entry, dict):
+            continue
+        con_id = entry.get("con_id")
+        cached_at = entry.get("cached_at")
+        if (
+            isinstance(con_id, int)
+            and con_id > 0
+            and isinstance(cached_at, (int, float))
+        ):
+            entries[symbol] = {"con_id": con_id, "cached_at": cached_at}
+    return entries
+
+
+def load_cache() -> dict[str, int]:
+    """Return the unexpired ``symbol -> conId`` mapping (empty if unavailable)."""
+
+    ttl = json_cache.cache_ttl(_TTL_ENV)
+    if not ttl:
+        return {}
+    now = time.time()
+    return {
+        symbol: entry["con_id"]
+        for symbol, entry in _read_entries().items()
+        if now - entry["cached_at"] < ttl
+    }
+
+
+def update_cache(learned: Mapping[str, int], evicted: Iterable[str] = ()) -> None:
+    """Record ``learned`` contract ids and drop ``evicted`` symbols.
+
+    The file is rewritten atomically; expired entries are pruned on the way.
+    """
+
+    ttl = json_cache.cache_ttl(_TTL_ENV)
+    if not ttl:
+        return
+    evicted = set(evicted)
+    if not learned and not evicted:
+        return
+    with _update_lock:
+        now = time.time()
+        entries = {
+            symbol: entry
+            for symbol, entry in _read_entries().items()
+            if symbol not in evicted and now - entry["cached_at"] < ttl
+        }
+        for symbol, con_id in learned.items():
+            entries[symbol] = {"con_id": con_id, "cached_at": now}
+        json_cache.store(_CACHE_FILE, entries)
@@ -0,0 +1,80 @@
+"""Small on-disk JSON caches with a configurable lifetime.
+
+Cache files live in ``IB_SIMPLE_CACHE_DIR`` (default ``~/.cache/ib_simple``)
+and each cache reads its lifetime in seconds from its own environment
+variable, where ``0`` disables it.  Reads and writes are best effort: an
+unreadable file behaves as an empty cache and a failed write is logged and
+otherwise ignored.  All functions do blocking file I/O.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Mapping
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TTL = 30 * 24 * 3600.0
+
+
+def cache_path(name: str) -> Path:
+    """Return the path of the cache file called ``name``."""
+
+    cache_dir = os.environ.get("IB_SIMPLE_CACHE_DIR")
+    base = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "ib_simple"
+    return base / name
+
+
+def cache_ttl(env_var: str, default: float = DEFAULT_TTL) -> float:
+    """Return the lifetime in seconds configured by ``env_var`` (0 disables)."""
+
+    raw = os.environ.get(env_var)
+    if not raw:
+        return default
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        log.warning("Ignoring invalid %s=%r", env_var, raw)
+        return default
+
+
+def load(name: str) -> dict[str, Any]:
+    """Return the JSON object stored in cache ``name`` (empty if unavailable)."""
+
+    try:
+        data = json.loads(cache_path(name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def store(name: str, entries: Mapping[str, Any]) -> None:
+    """Atomically replace cache ``name`` with ``entries``.
+
+    Each write goes through its own temporary file, so concurrent writers never
+    share one; the last replacement wins.
+    """
+
+    path = cache_path(name)
+    tmp_name: str | None = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=path.parent,
+            prefix=f"{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as tmp:
+            tmp_name = tmp.name
+            json.dump(dict(entries), tmp, sort_keys=True)
+        os.replace(tmp_name, path)
+    except OSError as exc:
+        if tmp_name is not None:
+            Path(tmp_name).unlink(missing_ok=True)
+        log.warning("Could not write cache %s: %s", path, exc)
@@ -2,21 +2,46 @@
 
 from __future__ import annotations
 
-import copy
+import asyncio
 import csv
+import sys
+import time
+from collections import Counter
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Iterable, Mapping
 
 from ib_async import IB
 from ib_async.contract import Stock
 
+from . import json_cache
+
 
 class PortfolioCSVError(Exception):
     """Raised when portfolio CSV validation fails."""
 
 
-def _parse_percent(value: str, *, symbol: str, model: str) -> float:
-    """Parse a percentage string into a float."""
+# Symbols already confirmed as USD ETFs during this process. Contract metadata
+# does not change within a session, so repeat loads skip the IB round-trip.
+_VALIDATED: set[str] = set()
+
+# Maximum number of contract detail requests in flight at once; keeps well
+# below the IB API limit on concurrent requests.
+_MAX_CONCURRENT_LOOKUPS = 8
+
+# Maximum number of portfolio CSVs read at once by ``load_portfolios_map``;
+# bounds worker threads and open file handles for large account lists.
+_MAX_CONCURRENT_LOADS = 8
+
+# Successful validations are also persisted so later runs can skip IB
+# entirely.  ``IB_SIMPLE_CACHE_DIR`` relocates the file and
+# ``IB_SIMPLE_VALIDATION_TTL`` sets its lifetime in seconds (0 disables it).
+_VALIDATION_CACHE_FILE = "etf_validation.json"
+_VALIDATION_TTL_ENV = "IB_SIMPLE_VALIDATION_TTL"
+
+
+def _parse_percent(value: str, *, symbol: str, model: str, low: float) -> float:
+    """Parse a percentage string into a float within ``[low, 100]``."""
 
     text = value.strip()
     if not text:
@@ -30,11 +55,7 @@ def _parse_percent(value: str, *, symbol: str, model: str) -> float:
             f"{symbol}: invalid percentage for {model}: {value!r}"
         ) from exc
 
-    if symbol == "CASH":
-        limit_low = -100.0
-    else:
-        limit_low = 0.0
-    if pct < limit_low or pct > 100.0:
+    if pct < low or pct > 100.0:
         raise PortfolioCSVError(f"{symbol}: percent out of range for {model}: {pct}")
     return pct
 
@@ -44,6 +65,10 @@ async def validate_symbols(
 ) -> None:
     """Ensure ``symbols`` are valid USD-denominated ETFs.
 
+    Symbols validated successfully are remembered for the lifetime of the
+    process and recorded in an on-disk cache, so they are not looked up again
+    until the cache entry expires.
+
     Parameters
     ----------
     symbols:
@@ -57,18 +82,50 @@ async def validate_symbols(
         If a symbol is unknown or does not represent a USD ETF.
     """
 
-    symbols_to_check = [s for s in symbols if s != "CASH"]
+    symbols_to_check = [s for s in symbols if s != "CASH" and s not in _VALIDATED]
     if not symbols_to_check:
         return
 
+    ttl = json_cache.cache_ttl(_VALIDATION_TTL_ENV)
+    disk_cache = json_cache.load(_VALIDATION_CACHE_FILE) if ttl else {}
+    if disk_cache:
+        now = time.time()
+        fresh = set()
+        for symbol in symbols_to_check:
+            entry = disk_cache.get(symbol)
+            if not isinstance(entry, dict):
+                continue
+            verified_at = entry.get("verified_at")
+            if isinstance(verified_at, (int, float)) and now - verified_at < ttl:
+                fresh.add(symbol)
+        _VALIDATED.update(fresh)
+        symbols_to_check = [s for s in symbols_to_check if s not in fresh]
+        if not symbols_to_check:
+            return
+
     ib = IB()
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_LOOKUPS)
+
+    async def lookup(symbol: str) -> list:
+        async with sem:
+            return await ib.reqContractDetailsAsync(
+                Stock(symbol=symbol, currency="USD")
+            )
+
     try:
         try:
             await ib.connectAsync(host, port, clientId=client_id)
-            for symbol in symbols_to_check:
-                details = await ib.reqContractDetailsAsync(
-                    Stock(symbol=symbol, currency="USD")
-                )
+            tasks = [asyncio.create_task(lookup(s)) for s in symbols_to_check]
+            try:
+                results = await asyncio.gather(*tasks)
+            except BaseException:
+                # Do not leave sibling lookups running against IB unobserved.
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+            # Check in input order so the first offending symbol is reported.
+            for symbol, details in zip(symbols_to_check, results):
                 if not details:
                     raise PortfolioCSVError(f"Unknown ETF symbol: {symbol}")
                 cd = details[0]
@@ -79,6 +136,16 @@ async def validate_symbols(
                     or cd.stockType != "ETF"
                 ):
                     raise PortfolioCSVError(f"{symbol}: not a USD-denominated ETF")
+            _VALIDATED.update(symbols_to_check)
+            if ttl:
+                verified_at = time.time()
+                for symbol in symbols_to_check:
+                    disk_cache[symbol] = {
+                        "currency": "USD",
+                        "stock_type": "ETF",
+                        "verified_at": verified_at,
+                    }
+                json_cache.store(_VALIDATION_CACHE_FILE, disk_cache)
         except OSError as exc:  # pragma: no cover - network failure
             # Limit this handler to connection-related issues so that
             # PortfolioCSVError raised above (e.g., unknown symbols) is not
@@ -103,62 +170,125 @@ async def load_portfolios(
         percentage strings.
     """
 
-    portfolios, _ = _parse_csv(path, ["ETF", "SMURF", "BADASS", "GLTR"])
+    portfolios, _, totals = _read_csv(path, ["ETF", "SMURF", "BADASS", "GLTR"])
     await validate_symbols(portfolios.keys(), host=host, port=port, client_id=client_id)
-    _validate_totals(portfolios)
+    _validate_totals(totals, portfolios.get("CASH"))
     return portfolios
 
 
 def _parse_csv(
     path: Path, expected: list[str] | None = None
-) -> tuple[dict[str, dict[str, float]], list[str]]:
-    with path.open(newline="") as fh:
-        filtered = (
-            line for line in fh if line.strip() and not line.lstrip().startswith("#")
-        )
-        reader = csv.DictReader(filtered)
-        fieldnames = reader.fieldnames
-        if fieldnames is None:
-            raise PortfolioCSVError("Missing header")
-        field_list = list(fieldnames)
-        if len(field_list) != len(set(field_list)):
-            dupes = {n for n in field_list if field_list.count(n) > 1}
-            raise PortfolioCSVError(f"Duplicate columns: {', '.join(sorted(dupes))}")
-        exp = expected or field_list
-        if set(field_list) != set(exp):
-            extra = set(field_list) - set(exp)
-            missing = set(exp) - set(field_list)
-            parts = []
-            if extra:
-                parts.append(f"Unknown columns: {', '.join(sorted(extra))}")
-            if missing:
-                parts.append(f"Missing columns: {', '.join(sorted(missing))}")
+) -> tuple[dict[str, dict[str, float]], list[str], dict[str, float]]:
+    """Parse ``path`` into per-symbol weights.
+
+    Returns the portfolios, the header columns and the per-model sum of all
+    non-CASH weights, accumulated while the rows are read.
+    """
+    # Read and filter the file in one go; comment and blank lines are dropped
+    # before the CSV reader sees them.
+    lines = [
+        line
+        for line in path.read_text().splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise PortfolioCSVError("Missing header")
+    field_list = list(header)
+    counts = Counter(field_list)
+    if len(counts) != len(field_list):
+        dupes = [n for n, c in counts.items() if c > 1]
+        raise PortfolioCSVError(f"Duplicate columns: {', '.join(sorted(dupes))}")
+    exp = expected or field_list
+    # The header normally matches ``expected`` exactly; only fall back to
+    # the set comparison when it does not.
+    if field_list != exp:
+        wanted = set(exp)
+        extra = counts.keys() - wanted
+        missing = wanted - counts.keys()
+        parts = []
+        if extra:
+            parts.append(f"Unknown columns: {', '.join(sorted(extra))}")
+        if missing:
+            parts.append(f"Missing columns: {', '.join(sorted(missing))}")
+        if parts:
             raise PortfolioCSVError("; ".join(parts))
-        portfolios: Dict[str, Dict[str, float]] = {}
-        for row in reader:
-            symbol = (row.get("ETF") or "").strip()
-            if not symbol:
-                raise PortfolioCSVError("Blank ETF symbol")
-            if symbol in portfolios:
-                raise PortfolioCSVError(f"Duplicate ETF symbol: {symbol}")
-            weights: Dict[str, float] = {}
-            for model in field_list[1:]:
-                raw = row.get(model) or ""
-                weight = _parse_percent(raw, symbol=symbol, model=model)
-                weights[model.lower()] = weight
-            portfolios[symbol] = weights
-    return portfolios, field_list
-
-
-def _validate_totals(portfolios: Dict[str, Dict[str, float]]) -> None:
-    models = next(iter(portfolios.values())).keys() if portfolios else []
-    totals = {m: 0.0 for m in models}
-    for symbol, weights in portfolios.items():
-        if symbol == "CASH":
+    # Resolve column positions once so rows can be read by index instead of
+    # materialising a dict per row.
+    index = {name: i for i, name in enumerate(field_list)}
+    # A missing ETF column points past the row so symbols read as blank.
+    etf_i = index.get("ETF", len(field_list))
+    # Interned keys are identical to the "smurf"/"badass"/"gltr" literals
+    # used by the planner, so its weight lookups hit the identity fast path.
+    model_idx = [
+        (model, sys.intern(model.lower()), index[model]) for model in field_list[1:]
+    ]
+    portfolios: Dict[str, Dict[str, float]] = {}
+    totals = {key: 0.0 for _, key, _ in model_idx}
+    for row in reader:
+        if not row:
             continue
-        for model, weight in weights.items():
-            totals[model] += weight
-    cash_weights = portfolios.get("CASH")
+        width = len(row)
+        symbol = (row[etf_i] if etf_i < width else "").strip()
+        if not symbol:
+            raise PortfolioCSVError("Blank ETF symbol")
+        if symbol in portfolios:
+            raise PortfolioCSVError(f"Duplicate ETF symbol: {symbol}")
+        # CASH may be negative (borrowing) and is excluded from asset totals.
+        is_cash = symbol == "CASH"
+        low = -100.0 if is_cash else 0.0
+        weights: Dict[str, float] = {}
+        for model, key, i in model_idx:
+            raw = row[i] if i < width else ""
+            weight = _parse_percent(raw, symbol=symbol, model=model, low=low)
+            weights[key] = weight
+            if not is_cash:
+                totals[key] += weight
+        portfolios[symbol] = weights
+    if not portfolios:
+        # Nothing to check for a header-only file.
+        totals = {}
+    return portfolios, field_list, totals
+
+
+def _read_csv(
+    path: Path, expected: list[str] | None = None
+) -> tuple[dict[str, dict[str, float]], list[str], dict[str, float]]:
+    """Return :func:`_parse_csv` results, reusing an unchanged file's parse.
+
+    Parses are cached per file while its size and modification time stay the
+    same; each call gets its own copy of the weights.
+    """
+
+    try:
+        resolved = path.resolve()
+        st = resolved.stat()
+    except OSError:
+        # Let the parser report unreadable files.
+        return _parse_csv(path, expected)
+    portfolios, header, totals = _parse_csv_cached(
+        resolved, st.st_mtime_ns, st.st_size, tuple(expected) if expected else None
+    )
+    return {sym: dict(w) for sym, w in portfolios.items()}, list(header), dict(totals)
+
+
+@lru_cache(maxsize=32)
+def _parse_csv_cached(
+    path: Path, mtime_ns: int, size: int, expected: tuple[str, ...] | None
+) -> tuple[dict[str, dict[str, float]], list[str], dict[str, float]]:
+    return _parse_csv(path, list(expected) if expected else None)
+
+
+def clear_parse_cache() -> None:
+    """Drop cached CSV parses used by both portfolio loaders."""
+
+    _parse_csv_cached.cache_clear()
+
+
+def _validate_totals(
+    totals: Mapping[str, float], cash_weights: Mapping[str, float] | None
+) -> None:
     for model, total in totals.items():
         if cash_weights is None:
             if abs(total - 100.0) > 0.01:
@@ -184,19 +314,44 @@ async def load_portfolios_map(
     expected: list[str] | None = None,
 ) -> dict[str, dict[str, dict[str, float]]]:
     expected = expected or ["ETF", "SMURF", "BADASS", "GLTR"]
+    # Resolve the paths so that different references (relative vs. absolute)
+    # to the same file are parsed only once.
+    resolved = {account: Path(p).resolve() for account, p in paths.items()}
+    unique = list(dict.fromkeys(resolved.values()))
+    # Files are read and parsed in worker threads concurrently; errors are
+    # then raised in path order so the reported file does not depend on
+    # which parse finished first.
+    sem = asyncio.Semaphore(_MAX_CONCURRENT_LOADS)
+
+    async def parse(
+        path: Path,
+    ) -> tuple[dict[str, dict[str, float]], list[str], dict[str, float]]:
+        async with sem:
+            return await asyncio.to_thread(_read_csv, path, expected)
+
+    parsed = await asyncio.gather(
+        *(parse(path) for path in unique), return_exceptions=True
+    )
     cache: Dict[Path, dict[str, dict[str, float]]] = {}
-    result: Dict[str, dict[str, dict[str, float]]] = {}
     symbols: set[str] = set()
-    for account, p in paths.items():
-        # Resolve the path so that different references (relative vs. absolute)
-        # to the same file map to a single cache entry.
-        path = Path(p).resolve()
-        data = cache.get(path)
-        if data is None:
-            portfolios, expected = _parse_csv(path, expected)
-            _validate_totals(portfolios)
-            cache[path] = portfolios
-            symbols.update(portfolios.keys())
-        result[account] = copy.deepcopy(cache[path])
+    for path, outcome in zip(unique, parsed):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        portfolios, _, totals = outcome
+        _validate_totals(totals, portfolios.get("CASH"))
+        cache[path] = portfolios
+        symbols.update(portfolios.keys())
+
+    result: Dict[str, dict[str, dict[str, float]]] = {}
+    seen: set[Path] = set()
+    for account, path in resolved.items():
+        data = cache[path]
+        if path not in seen:
+            seen.add(path)
+            result[account] = data
+        else:
+            # Weights are plain floats, so copying the per-symbol dicts is
+            # enough to keep accounts sharing a file independent.
+            result[account] = {sym: dict(w) for sym, w in data.items()}
     await validate_symbols(symbols, host=host, port=port, client_id=client_id)
     return result
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import atexit
 import csv
+import io
 import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Iterable, Iterator, Mapping, TextIO
 
 from src.core.drift import Drift
 from src.core.sizing import SizedTrade
@@ -15,13 +25,75 @@ from . import AppConfig
 
 log = logging.getLogger(__name__)
 
+_by_symbol = attrgetter("symbol")
 
+# Log records are queued by the logging call and written to the run's log
+# file by a background listener thread, keeping file I/O off the event loop.
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+_log_handlers: dict[Path, logging.Handler] = {}
+_log_listeners: dict[Path, logging.handlers.QueueListener] = {}
+# Root level to restore once the last log file is retired.
+_previous_root_level: int | None = None
+
+# Report directories already created (or found) during this process.
+_ENSURED: set[Path] = set()
+
+# Reports are written with a large buffer so each file is flushed in a few
+# writes rather than one per 8 KiB block.
+_WRITE_BUFFER = 1 << 20
+
+
+@lru_cache(maxsize=32)
 def _format_ts(ts: datetime) -> str:
-    """Return a filesystem-friendly timestamp string."""
+    """Return a filesystem-friendly timestamp string.
+
+    Every report of a run shares one timestamp, so results are memoised.
+    """
 
     return ts.strftime("%Y%m%d_%H%M%S")
 
 
+def _ensure_dir(path: Path) -> None:
+    """Create ``path`` (and parents) unless this process already has."""
+
+    if path not in _ENSURED:
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED.add(path)
+
+
+def _iso(value: Any) -> str | None:
+    """Return ``value`` as an ISO string, passing ``None`` and strings through."""
+
+    if value is None or type(value) is str:
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _write_csv(
+    path: Path, fieldnames: list[str], rows: Iterable[tuple[Any, ...]]
+) -> None:
+    """Render ``rows`` in memory and write them to ``path`` in one call.
+
+    The file is written under a temporary name and renamed into place, so
+    readers never see a partially written report.
+    """
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fieldnames)
+    writer.writerows(rows)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", newline="", buffering=_WRITE_BUFFER) as fh:
+            fh.write(buf.getvalue())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def setup_logging(report_dir: Path, level: str, ts: datetime | str) -> Path:
     """Configure root logging to a timestamped file.
 
@@ -39,20 +111,68 @@ def setup_logging(report_dir: Path, level: str, ts: datetime | str) -> Path:
     -------
     Path
         Path to the created log file.
+
+    Records are handed to a background thread that writes the file.  Calling
+    this again for the same file only updates the level, while a new file
+    replaces the previous one; :func:`stop_log_listeners` (also run at exit)
+    drains whatever is still queued.  Like :func:`logging.basicConfig`, this
+    does nothing when root logging was already configured elsewhere.
     """
 
-    report_dir.mkdir(parents=True, exist_ok=True)
+    global _previous_root_level
+
+    _ensure_dir(report_dir)
     ts_str = ts if isinstance(ts, str) else _format_ts(ts)
     log_path = report_dir / f"rebalance_{ts_str}.log"
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
-    logging.basicConfig(
-        filename=str(log_path),
-        level=numeric_level,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    )
+    root = logging.getLogger()
+    ours = set(_log_handlers.values())
+    if any(handler not in ours for handler in root.handlers):
+        return log_path
+    if _previous_root_level is None:
+        _previous_root_level = root.level
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    if log_path not in _log_handlers:
+        _retire_log_listeners()
+        file_handler = logging.FileHandler(log_path)
+        file_handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+        log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(handler)
+        _log_handlers[log_path] = handler
+        _log_listeners[log_path] = listener
     return log_path
 
 
+def stop_log_listeners() -> None:
+    """Write out queued log records and stop the background log writers.
+
+    Root logging is returned to the handlers and level it had before
+    :func:`setup_logging` configured it.
+    """
+
+    global _previous_root_level
+
+    _retire_log_listeners()
+    if _previous_root_level is not None:
+        logging.getLogger().setLevel(_previous_root_level)
+        _previous_root_level = None
+
+
+def _retire_log_listeners() -> None:
+    root = logging.getLogger()
+    while _log_listeners:
+        log_path, listener = _log_listeners.popitem()
+        root.removeHandler(_log_handlers.pop(log_path))
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_log_listeners)
+
+
 def write_pre_trade_report(
     report_dir: Path,
     ts: datetime,
@@ -69,7 +189,7 @@ def write_pre_trade_report(
 ) -> Path:
     """Write a pre-trade CSV report and return its path."""
 
-    report_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(report_dir)
     path = report_dir / f"rebalance_pre_{account_id}_{_format_ts(ts)}.csv"
 
     fieldnames = [
@@ -96,46 +216,68 @@ def write_pre_trade_report(
     ]
 
     trades_by_symbol = {t.symbol: t for t in trades}
-    timestamp_run = ts.isoformat()
-    order_type = cfg.execution.order_type
-    algo = cfg.execution.algo_preference
-
-    with path.open("w", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        for d in sorted(drifts, key=lambda d: d.symbol):
-            trade = trades_by_symbol.get(d.symbol)
+    # Columns that are constant for the whole report are assembled once.
+    head = (ts.isoformat(), account_id)
+    execution = (cfg.execution.order_type, cfg.execution.algo_preference)
+    tail = (
+        net_liq,
+        pre_gross_exposure,
+        post_gross_exposure,
+        pre_leverage,
+        post_leverage,
+    )
+
+    def rows() -> Iterator[tuple[Any, ...]]:
+        """Yield one tuple per drift, in ``fieldnames`` order."""
+
+        trade_for = trades_by_symbol.get
+        price_for = prices.get
+        for d in sorted(drifts, key=_by_symbol):
+            symbol, action = d.symbol, d.action
+            is_cash = symbol == "CASH"
+            trade = trade_for(symbol)
             qty = trade.quantity if trade else 0.0
-            est_price = prices.get(d.symbol, 1.0 if d.symbol == "CASH" else 0.0)
+            est_price = 1.0 if is_cash else price_for(symbol, 0.0)
             est_value = trade.notional if trade else 0.0
-            writer.writerow(
-                {
-                    "timestamp_run": timestamp_run,
-                    "account_id": account_id,
-                    "symbol": d.symbol,
-                    "is_cash": d.symbol == "CASH",
-                    "target_wt_pct": d.target_wt_pct,
-                    "current_wt_pct": d.current_wt_pct,
-                    "drift_pct": d.drift_pct,
-                    "drift_pre_buffer_usd": d.drift_usd,
-                    "action": d.action,
-                    "qty_shares": qty,
-                    "est_price": est_price,
-                    "order_type": order_type,
-                    "algo": algo,
-                    "est_value_usd": est_value,
-                    "planned_value_usd": est_value,
-                    "net_liq": net_liq,
-                    "pre_gross_exposure": pre_gross_exposure,
-                    "post_gross_exposure": post_gross_exposure,
-                    "pre_leverage": pre_leverage,
-                    "post_leverage": post_leverage,
-                }
+            yield (
+                head
+                + (
+                    symbol,
+                    is_cash,
+                    d.target_wt_pct,
+                    d.current_wt_pct,
+                    d.drift_pct,
+                    d.drift_usd,
+                    action,
+                    qty,
+                    est_price,
+                )
+                + execution
+                + (est_value, est_value)
+                + tail
             )
+
+    _write_csv(path, fieldnames, rows())
     log.info("Pre-trade report written to %s", path)
     return path
 
 
+@dataclass(slots=True)
+class _AggResult:
+    """Execution results merged across passes for one (symbol, action)."""
+
+    fill_qty: float
+    fill_value: float
+    fill_price: float  # weighted average, kept current as passes merge
+    fill_time: str | None
+    commission: float
+    commission_placeholder: bool
+    status: str | None
+    error: str
+    notes: str
+    missing_exec_ids: list[str]
+
+
 def write_post_trade_report(
     report_dir: Path,
     ts: datetime,
@@ -161,7 +303,7 @@ def write_post_trade_report(
         as the pre-trade report.
     """
 
-    report_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(report_dir)
     path = report_dir / f"rebalance_post_{account_id}_{_format_ts(ts)}.csv"
 
     fieldnames = [
@@ -195,30 +337,27 @@ def write_post_trade_report(
         "notes",
     ]
 
-    # Aggregate trades and results across all passes for each (symbol, action)
-    aggregated_trades: dict[tuple[str, str], SizedTrade] = {}
+    # Aggregate trades and results across all passes for each (symbol, action).
+    # Trades accumulate in place as ``[quantity, notional]``.
+    # Keys are interned once here so later lookups compare by identity.
+    intern = sys.intern
+    aggregated_trades: dict[tuple[str, str], list[float]] = {}
     for t in trades:
-        trade_key = (t.symbol, t.action)
-        if trade_key in aggregated_trades:
-            prev = aggregated_trades[trade_key]
-            aggregated_trades[trade_key] = SizedTrade(
-                t.symbol,
-                t.action,
-                prev.quantity + t.quantity,
-                prev.notional + t.notional,
-            )
+        trade_key = (intern(t.symbol), intern(t.action))
+        acc = aggregated_trades.get(trade_key)
+        if acc is None:
+            aggregated_trades[trade_key] = [t.quantity, t.notional]
         else:
-            aggregated_trades[trade_key] = SizedTrade(
-                t.symbol, t.action, t.quantity, t.notional
-            )
+            acc[0] += t.quantity
+            acc[1] += t.notional
 
-    aggregated_results: dict[tuple[str | None, str | None], dict[str, Any]] = {}
+    aggregated_results: dict[tuple[str, str | None], _AggResult] = {}
     for r in results:
         sym = r.get("symbol")
         if sym is None:
             continue
         act = r.get("action")
-        res_key = (sym, act)
+        res_key = (intern(sym), intern(act) if isinstance(act, str) else act)
         qty_any = r.get("fill_qty")
         if qty_any is None:
             qty_any = r.get("filled", 0.0)
@@ -234,181 +373,198 @@ def write_post_trade_report(
         else:
             commission = float(r.get("commission", 0.0))
 
-        ts_any = r.get("fill_time")
-        if isinstance(ts_any, datetime):
-            ts_str = ts_any.isoformat()
-        elif ts_any is None:
-            ts_str = None
-        else:
-            ts_str = str(ts_any)
+        ts_str = _iso(r.get("fill_time"))
 
         agg = aggregated_results.get(res_key)
         if agg is None:
-            aggregated_results[res_key] = {
-                "fill_qty": qty,
-                "_fill_value": qty * price,
-                "fill_price": price,
-                "fill_time": ts_str,
-                "commission": commission,
-                "commission_placeholder": r.get("commission_placeholder", False),
-                "status": r.get("status"),
-                "error": r.get("error", ""),
-                "notes": r.get("notes", ""),
-                "missing_exec_ids": list(r.get("missing_exec_ids", [])),
-            }
+            value = qty * price
+            aggregated_results[res_key] = _AggResult(
+                fill_qty=qty,
+                fill_value=value,
+                fill_price=value / qty if qty else price,
+                fill_time=ts_str,
+                commission=commission,
+                commission_placeholder=r.get("commission_placeholder", False),
+                status=r.get("status"),
+                error=r.get("error", ""),
+                notes=r.get("notes", ""),
+                missing_exec_ids=list(r.get("missing_exec_ids", [])),
+            )
         else:
-            agg["fill_qty"] += qty
-            agg["_fill_value"] += qty * price
+            agg.fill_qty += qty
+            agg.fill_value += qty * price
+            if agg.fill_qty:
+                agg.fill_price = agg.fill_value / agg.fill_qty
             if ts_str is not None:
-                agg["fill_time"] = ts_str
-            agg["commission"] += commission
-            agg["commission_placeholder"] = agg["commission_placeholder"] or bool(
+                agg.fill_time = ts_str
+            agg.commission += commission
+            agg.commission_placeholder = agg.commission_placeholder or bool(
                 r.get("commission_placeholder", False)
             )
             status = r.get("status")
             if status:
-                agg["status"] = status
+                agg.status = status
             error = r.get("error")
             if error:
-                agg["error"] = "; ".join(filter(None, [agg.get("error", ""), error]))
+                agg.error = "; ".join(filter(None, [agg.error, error]))
             notes = r.get("notes")
             if notes:
-                agg["notes"] = "; ".join(filter(None, [agg.get("notes", ""), notes]))
-            agg.setdefault("missing_exec_ids", [])
-            agg["missing_exec_ids"].extend(r.get("missing_exec_ids", []))
-
-    # Finalize aggregated results by computing weighted average fill price
-    results_by_key: dict[tuple[str | None, str | None], dict[str, Any]] = {}
-    for res_key, agg in aggregated_results.items():
-        qty = agg.get("fill_qty", 0.0)
-        value = agg.pop("_fill_value", 0.0)
-        if qty:
-            agg["fill_price"] = value / qty
-        results_by_key[res_key] = agg
-
-    trades_by_key = aggregated_trades
-    timestamp_run = ts.isoformat()
-    order_type = cfg.execution.order_type
-    algo = cfg.execution.algo_preference
-
-    with path.open("w", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        for d in sorted(drifts, key=lambda d: d.symbol):
-            trade = trades_by_key.get((d.symbol, d.action))
-            res = results_by_key.get((d.symbol, d.action), {})
-            planned_qty = trade.quantity if trade else 0.0
-            est_price = prices.get(d.symbol, 1.0 if d.symbol == "CASH" else 0.0)
-            est_value = trade.notional if trade else 0.0
+                agg.notes = "; ".join(filter(None, [agg.notes, notes]))
+            agg.missing_exec_ids.extend(r.get("missing_exec_ids", []))
+
+    head = (ts.isoformat(), account_id)
+    execution = (cfg.execution.order_type, cfg.execution.algo_preference)
+    tail = (
+        net_liq,
+        pre_gross_exposure,
+        post_gross_exposure,
+        pre_leverage,
+        post_leverage,
+    )
 
-            fill_qty = res.get("fill_qty")
-            if fill_qty is None:
-                fill_qty = res.get("filled")
-            if fill_qty is None:
+    def rows() -> Iterator[tuple[Any, ...]]:
+        """Yield one tuple per drift, in ``fieldnames`` order."""
+
+        trade_for = aggregated_trades.get
+        result_for = aggregated_results.get
+        price_for = prices.get
+        for d in sorted(drifts, key=_by_symbol):
+            symbol, action = d.symbol, d.action
+            is_cash = symbol == "CASH"
+            key = (symbol, action)
+            trade = trade_for(key)
+            res = result_for(key)
+            planned_qty = trade[0] if trade else 0.0
+            est_price = 1.0 if is_cash else price_for(symbol, 0.0)
+            est_value = trade[1] if trade else 0.0
+
+            if res is None:
+                # No execution for this row: report the plan as-is.
                 fill_qty = planned_qty
-
-            fill_price = res.get("fill_price")
-            if fill_price is None:
-                fill_price = res.get("avg_fill_price")
-            if fill_price is None:
                 fill_price = est_price
-
-            fill_ts_any = res.get("fill_time")
-            if isinstance(fill_ts_any, datetime):
-                fill_ts = fill_ts_any.isoformat()
-            elif fill_ts_any is None:
                 fill_ts = None
+                commission = 0.0
+                commission_placeholder = False
+                status = error = notes = ""
             else:
-                fill_ts = str(fill_ts_any)
-
-            exec_comms = res.get("exec_commissions")
-            if isinstance(exec_comms, dict) and exec_comms:
-                commission = sum(exec_comms.values())
-            else:
-                commission = res.get("commission", 0.0)
-            commission_placeholder = res.get("commission_placeholder", False)
-            notes = res.get("notes", "")
-            if commission_placeholder:
-                missing_ids = res.get("missing_exec_ids", [])
-                if missing_ids:
-                    msg = "missing commission execIds: " + ", ".join(missing_ids)
+                # Aggregation already resolved every fallback to a final value.
+                fill_qty = res.fill_qty
+                fill_price = res.fill_price
+                fill_ts = res.fill_time
+                commission = res.commission
+                commission_placeholder = res.commission_placeholder
+                status = res.status or ""
+                error = res.error
+                notes = res.notes
+                if commission_placeholder and res.missing_exec_ids:
+                    msg = "missing commission execIds: " + ", ".join(
+                        res.missing_exec_ids
+                    )
                     notes = f"{notes}; {msg}" if notes else msg
 
-            writer.writerow(
-                {
-                    "timestamp_run": timestamp_run,
-                    "account_id": account_id,
-                    "symbol": d.symbol,
-                    "is_cash": d.symbol == "CASH",
-                    "target_wt_pct": d.target_wt_pct,
-                    "current_wt_pct": d.current_wt_pct,
-                    "drift_pct": d.drift_pct,
-                    "drift_pre_buffer_usd": d.drift_usd,
-                    "action": d.action,
-                    "qty_shares": planned_qty,
-                    "est_price": est_price,
-                    "order_type": order_type,
-                    "algo": algo,
-                    "est_value_usd": est_value,
-                    "planned_value_usd": est_value,
-                    "net_liq": net_liq,
-                    "pre_gross_exposure": pre_gross_exposure,
-                    "post_gross_exposure": post_gross_exposure,
-                    "pre_leverage": pre_leverage,
-                    "post_leverage": post_leverage,
-                    "fill_qty": fill_qty,
-                    "fill_price": fill_price,
-                    "fill_timestamp": fill_ts or "",
-                    "commission": commission,
-                    "commission_placeholder": commission_placeholder,
-                    "status": res.get("status", ""),
-                    "error": res.get("error", ""),
-                    "notes": notes,
-                }
+            yield (
+                head
+                + (
+                    symbol,
+                    is_cash,
+                    d.target_wt_pct,
+                    d.current_wt_pct,
+                    d.drift_pct,
+                    d.drift_usd,
+                    action,
+                    planned_qty,
+                    est_price,
+                )
+                + execution
+                + (est_value, est_value)
+                + tail
+                + (
+                    fill_qty,
+                    fill_price,
+                    fill_ts or "",
+                    commission,
+                    commission_placeholder,
+                    status,
+                    error,
+                    notes,
+                )
             )
+
+    _write_csv(path, fieldnames, rows())
     log.info("Post-trade report written to %s", path)
     return path
 
 
+_SUMMARY_FIELDS = [
+    "timestamp_run",
+    "account_id",
+    "planned_orders",
+    "submitted",
+    "filled",
+    "rejected",
+    "buy_usd",
+    "sell_usd",
+    "pre_leverage",
+    "post_leverage",
+    "status",
+    "error",
+]
+_SUMMARY_FIELD_SET = frozenset(_SUMMARY_FIELDS)
+
+# Run summary files stay open between appends; see :func:`close_run_summaries`.
+_summary_lock = threading.Lock()
+_summary_files: dict[Path, tuple[TextIO, Any]] = {}
+
+
 def append_run_summary(report_dir: Path, ts: datetime, row: Mapping[str, Any]) -> Path:
     """Append a single row to the run summary CSV file.
 
     The file is named ``run_summary_<timestamp>.csv`` where ``timestamp`` is
     derived from ``ts`` using :func:`_format_ts`.  A header row is written if the
-    file does not yet exist.
+    file does not yet exist.  The file is kept open for further rows and
+    flushed after every append.
     """
 
-    report_dir.mkdir(parents=True, exist_ok=True)
+    extra = row.keys() - _SUMMARY_FIELD_SET
+    if extra:
+        raise ValueError(
+            f"run summary row contains unknown fields: {', '.join(sorted(extra))}"
+        )
     path = report_dir / f"run_summary_{_format_ts(ts)}.csv"
-
-    fieldnames = [
-        "timestamp_run",
-        "account_id",
-        "planned_orders",
-        "submitted",
-        "filled",
-        "rejected",
-        "buy_usd",
-        "sell_usd",
-        "pre_leverage",
-        "post_leverage",
-        "status",
-        "error",
-    ]
-
-    write_header = not path.exists() or path.stat().st_size == 0
-    with path.open("a", newline="") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        if write_header:
-            writer.writeheader()
-        writer.writerow(row)
+    with _summary_lock:
+        entry = _summary_files.get(path)
+        if entry is None:
+            _ensure_dir(report_dir)
+            write_header = not path.exists() or path.stat().st_size == 0
+            new_fh = path.open("a", newline="", buffering=_WRITE_BUFFER)
+            new_writer = csv.writer(new_fh)
+            if write_header:
+                new_writer.writerow(_SUMMARY_FIELDS)
+            entry = _summary_files[path] = (new_fh, new_writer)
+        fh, writer = entry
+        writer.writerow([row.get(name, "") for name in _SUMMARY_FIELDS])
+        fh.flush()
     log.info("Run summary appended to %s", path)
     return path
 
 
+def close_run_summaries() -> None:
+    """Close run summary files left open by :func:`append_run_summary`."""
+
+    with _summary_lock:
+        for fh, _ in _summary_files.values():
+            fh.close()
+        _summary_files.clear()
+
+
+atexit.register(close_run_summaries)
+
+
 __all__ = [
     "setup_logging",
     "write_pre_trade_report",
     "write_post_trade_report",
     "append_run_summary",
+    "close_run_summaries",
+    "stop_log_listeners",
 ]
@@ -2,11 +2,9 @@
 
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 
 from .config_loader import ConfigError, load_config
-from .portfolio_csv import PortfolioCSVError, load_portfolios, load_portfolios_map
 
 
 async def main(
@@ -32,6 +30,9 @@ async def main(
         print(exc)
         raise SystemExit(1)
 
+    # Imported here so the CLI does not load ib_async until a config is valid.
+    from . import portfolio_csv
+
     cfg_dir = Path(config_path).resolve().parent
     global_path: Path | None = None
     if path is not None:
@@ -68,7 +69,7 @@ async def main(
                 path_map = {
                     acct: cfg.portfolio_paths[acct] for acct in cfg.accounts.ids
                 }
-            await load_portfolios_map(
+            await portfolio_csv.load_portfolios_map(
                 path_map,
                 host=cfg.ibkr.host,
                 port=cfg.ibkr.port,
@@ -78,13 +79,13 @@ async def main(
             if global_path is None:
                 print("CSV path required")
                 raise SystemExit(1)
-            await load_portfolios(
+            await portfolio_csv.load_portfolios(
                 global_path,
                 host=cfg.ibkr.host,
                 port=cfg.ibkr.port,
                 client_id=cfg.ibkr.client_id,
             )
-    except PortfolioCSVError as exc:
+    except portfolio_csv.PortfolioCSVError as exc:
         print(exc)
         raise SystemExit(1)
     print("OK")
@@ -92,6 +93,7 @@ async def main(
 
 if __name__ == "__main__":  # pragma: no cover - CLI utility
     import argparse
+    import asyncio
 
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
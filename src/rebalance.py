@@ -5,19 +5,21 @@ from __future__ import annotations
 import argparse
 import asyncio
 import logging
+import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Any, Coroutine, TypeVar
 
 from rich import print
 
 from src.broker.errors import IBKRError
 from src.broker.execution import submit_batch
-from src.broker.ibkr_client import IBKRClient
+from src.broker.ibkr_client import IBKRClient, SharedIBKRClient
 from src.core.confirmation import confirm_global, confirm_per_account
 from src.core.drift import compute_drift, prioritize_by_drift
 from src.core.errors import PlanningError
-from src.core.planner import Plan, _fetch_price, plan_account
+from src.core.planner import Plan, _fetch_price, _fetch_prices, plan_account
 from src.core.preview import render as render_preview
 from src.core.sizing import size_orders
 from src.io import (
@@ -31,11 +33,47 @@ from src.io.portfolio_csv import PortfolioCSVError
 from src.io.portfolio_csv import load_portfolios_map as load_portfolios
 from src.io.reporting import (
     append_run_summary,
+    close_run_summaries,
     setup_logging,
     write_post_trade_report,
     write_pre_trade_report,
 )
 
+T = TypeVar("T")
+
+# Run summary row recorded for an account that failed; see :func:`_fail_row`.
+_FAIL_TEMPLATE: dict[str, object] = {
+    "timestamp_run": "",
+    "account_id": "",
+    "planned_orders": 0,
+    "submitted": 0,
+    "filled": 0,
+    "rejected": 0,
+    "buy_usd": 0.0,
+    "sell_usd": 0.0,
+    "pre_leverage": 0.0,
+    "post_leverage": 0.0,
+    "status": "failed",
+    "error": "",
+}
+
+
+def _fail_row(
+    account_id: str, plan: Plan | None, exc: BaseException, ts_iso: str
+) -> dict[str, object]:
+    """Return a failed run summary row, carrying over ``plan`` totals if any."""
+
+    row = dict(_FAIL_TEMPLATE)
+    row["timestamp_run"] = ts_iso
+    row["account_id"] = account_id
+    row["error"] = str(exc)
+    if plan:
+        row["planned_orders"] = plan["planned_orders"]
+        row["buy_usd"] = plan["buy_usd"]
+        row["sell_usd"] = plan["sell_usd"]
+        row["pre_leverage"] = row["post_leverage"] = plan["pre_leverage"]
+    return row
+
 
 async def _print_err(msg: str, lock: asyncio.Lock | None) -> None:
     """Print ``msg`` using ``rich.print`` with optional ``asyncio.Lock``."""
@@ -63,6 +101,7 @@ async def _run(args: argparse.Namespace) -> list[tuple[str, str]]:
     if getattr(args, "parallel_accounts", False):
         cfg.accounts.parallel = True
     ts_dt = datetime.now(timezone.utc)
+    ts_iso = ts_dt.isoformat()
     timestamp = ts_dt.strftime("%Y%m%dT%H%M%S")
     setup_logging(report_dir, cfg.io.log_level, timestamp)
     logging.info("Loaded configuration from %s", cfg_path)
@@ -80,290 +119,233 @@ async def _run(args: argparse.Namespace) -> list[tuple[str, str]]:
     else:
         csv_path = csv_path.resolve()
     portfolio_paths: dict[str, Path] = getattr(cfg, "portfolio_paths", {})
-    path_map: dict[str, Path] = {}
-    for acct in cfg.accounts.ids:
-        p = portfolio_paths.get(acct, csv_path)
-        if not p.is_absolute():
-            p = (cfg_dir / p).resolve()
-        path_map[acct] = p
+    # Relative overrides are only joined lexically; ``load_portfolios``
+    # resolves each distinct path once when it reads the files.
+    cfg_dir_str = str(cfg_dir)
+
+    def _account_path(p: Path) -> Path:
+        if p.is_absolute():
+            return p
+        return Path(os.path.normpath(os.path.join(cfg_dir_str, p)))
+
+    path_map: dict[str, Path] = {
+        acct: _account_path(portfolio_paths.get(acct, csv_path))
+        for acct in cfg.accounts.ids
+    }
     print("[blue]Loading portfolios[/blue]")
-    for acct, p in path_map.items():
-        logging.info("Portfolio for %s loaded from %s", acct, p)
     portfolios_by_account = await load_portfolios(
         path_map,
         host=cfg.ibkr.host,
         port=cfg.ibkr.port,
         client_id=cfg.ibkr.client_id,
     )
+    logging.info(
+        "Loaded portfolios for %d accounts: %s",
+        len(path_map),
+        ", ".join(f"{acct}={p}" for acct, p in path_map.items()),
+    )
     failures: list[tuple[str, str]] = []
-    summary_rows: list[dict[str, object]] = []
+    accounts = cfg.accounts
+    confirm_mode = getattr(accounts, "confirm_mode", ConfirmMode.PER_ACCOUNT)
+    parallel = bool(getattr(accounts, "parallel", False))
+    pacing_sec = float(getattr(accounts, "pacing_sec", 0.0))
+    max_in_flight = int(getattr(accounts, "max_in_flight", 4)) if parallel else 1
+    # Run summary rows are buffered per account and written in account id
+    # order once an account and every account sorting before it are done.
+    sorted_ids = sorted(set(accounts.ids))
+    pending: dict[str, list[dict[str, object]]] = {}
+    done: set[str] = set()
+    flushed = 0
 
     def capture_summary(_: Path, __: datetime, row: dict[str, object]) -> None:
-        summary_rows.append(row)
+        pending.setdefault(str(row.get("account_id", "")), []).append(row)
 
-    accounts = cfg.accounts
-    confirm_mode = getattr(accounts, "confirm_mode", ConfirmMode.PER_ACCOUNT)
+    def record_failure(account_id: str, plan: Plan | None, exc: Exception) -> None:
+        # Only the first summary row per account reports its failure.
+        if not pending.get(account_id):
+            capture_summary(report_dir, ts_dt, _fail_row(account_id, plan, exc, ts_iso))
+
+    def finish_account(account_id: str) -> None:
+        nonlocal flushed
+        done.add(account_id)
+        while flushed < len(sorted_ids) and sorted_ids[flushed] in done:
+            for row in pending.pop(sorted_ids[flushed], []):
+                append_run_summary(report_dir, ts_dt, row)
+            flushed += 1
 
-    output_lock: asyncio.Lock | None = None
-    if getattr(accounts, "parallel", False):
-        output_lock = asyncio.Lock()
+    # Output from concurrently planned accounts is serialized through this lock.
+    output_lock = asyncio.Lock()
+    # Every account runs as its own task.  Without ``parallel`` one account is
+    # handled at a time, so inline confirmations prompt in order and
+    # ``pacing_sec`` is the pause after the previous account finishes; with it
+    # starts are staggered by ``pacing_sec`` and up to ``max_in_flight``
+    # accounts are planned concurrently over the shared session.
+    in_flight = asyncio.Semaphore(max_in_flight)
 
-    async def handle_account(account_id: str) -> Plan | None:
+    async def handle_account(account_id: str, idx: int) -> Plan | None:
         plan: Plan | None = None
+        deferred = False
         try:
-            cfg_acct = merge_account_overrides(cfg, account_id)
-            portfolios = portfolios_by_account[account_id]
-            plan = await plan_account(
-                account_id,
-                portfolios,
-                cfg_acct,
-                ts_dt,
-                client_factory=IBKRClient,
-                compute_drift=compute_drift,
-                prioritize_by_drift=prioritize_by_drift,
-                size_orders=size_orders,
-                fetch_price=_fetch_price,
-                render_preview=render_preview,
-                write_pre_trade_report=write_pre_trade_report,
-                output_lock=output_lock,
-            )
-            if confirm_mode is ConfirmMode.PER_ACCOUNT and not (
-                getattr(accounts, "parallel", False) and not args.yes
-            ):
-                await confirm_per_account(
-                    plan,
-                    args,
-                    cfg,
+            if parallel and idx and pacing_sec > 0:
+                await asyncio.sleep(idx * pacing_sec)
+            async with in_flight:
+                if not parallel and idx and pacing_sec > 0:
+                    await asyncio.sleep(pacing_sec)
+                cfg_acct = merge_account_overrides(cfg, account_id)
+                portfolios = portfolios_by_account[account_id]
+                plan = await plan_account(
+                    account_id,
+                    portfolios,
+                    cfg_acct,
                     ts_dt,
-                    client_factory=IBKRClient,
-                    submit_batch=submit_batch,
-                    append_run_summary=capture_summary,
-                    write_post_trade_report=write_post_trade_report,
+                    client_factory=lambda: client,
                     compute_drift=compute_drift,
                     prioritize_by_drift=prioritize_by_drift,
                     size_orders=size_orders,
+                    fetch_price=_fetch_price,
+                    fetch_prices=_fetch_prices,
+                    render_preview=render_preview,
+                    write_pre_trade_report=write_pre_trade_report,
                     output_lock=output_lock,
                 )
-                return None
-            return plan
+                if confirm_mode is ConfirmMode.PER_ACCOUNT and not (
+                    parallel and not args.yes
+                ):
+                    await confirm_per_account(
+                        plan,
+                        args,
+                        cfg,
+                        ts_dt,
+                        client_factory=lambda: client,
+                        submit_batch=submit_batch,
+                        append_run_summary=capture_summary,
+                        write_post_trade_report=write_post_trade_report,
+                        compute_drift=compute_drift,
+                        prioritize_by_drift=prioritize_by_drift,
+                        size_orders=size_orders,
+                        output_lock=output_lock,
+                    )
+                    return None
+                deferred = True
+                return plan
         except (ConfigError, IBKRError, PlanningError) as exc:
             logging.error("Error processing account %s: %s", account_id, exc)
             await _print_err(f"[red]{exc}[/red]", output_lock)
             failures.append((account_id, str(exc)))
-            planned_orders = plan["planned_orders"] if plan else 0
-            buy_usd = plan["buy_usd"] if plan else 0.0
-            sell_usd = plan["sell_usd"] if plan else 0.0
-            pre_leverage = plan["pre_leverage"] if plan else 0.0
-            if not any(r.get("account_id") == account_id for r in summary_rows):
-                capture_summary(
-                    report_dir,
-                    ts_dt,
-                    {
-                        "timestamp_run": ts_dt.isoformat(),
-                        "account_id": account_id,
-                        "planned_orders": planned_orders,
-                        "submitted": 0,
-                        "filled": 0,
-                        "rejected": 0,
-                        "buy_usd": buy_usd,
-                        "sell_usd": sell_usd,
-                        "pre_leverage": pre_leverage,
-                        "post_leverage": pre_leverage,
-                        "status": "failed",
-                        "error": str(exc),
-                    },
-                )
+            record_failure(account_id, plan, exc)
             return None
         except Exception as exc:  # noqa: BLE001
             logging.exception("Unhandled error processing account %s", account_id)
             await _print_err(f"[red]{exc}[/red]", output_lock)
             failures.append((account_id, str(exc)))
-            planned_orders = plan["planned_orders"] if plan else 0
-            buy_usd = plan["buy_usd"] if plan else 0.0
-            sell_usd = plan["sell_usd"] if plan else 0.0
-            pre_leverage = plan["pre_leverage"] if plan else 0.0
-            if not any(r.get("account_id") == account_id for r in summary_rows):
-                capture_summary(
-                    report_dir,
-                    ts_dt,
-                    {
-                        "timestamp_run": ts_dt.isoformat(),
-                        "account_id": account_id,
-                        "planned_orders": planned_orders,
-                        "submitted": 0,
-                        "filled": 0,
-                        "rejected": 0,
-                        "buy_usd": buy_usd,
-                        "sell_usd": sell_usd,
-                        "pre_leverage": pre_leverage,
-                        "post_leverage": pre_leverage,
-                        "status": "failed",
-                        "error": str(exc),
-                    },
-                )
+            record_failure(account_id, plan, exc)
             return None
+        finally:
+            # Accounts whose plan is confirmed later are finished there.
+            if not deferred:
+                finish_account(account_id)
 
-    plans: list[Plan] = []
-    if getattr(accounts, "parallel", False):
-        tasks: list[asyncio.Task] = []
-        task_accounts: list[str] = []
-        pacing = getattr(accounts, "pacing_sec", 0.0)
-
-        async def start_after_delay(aid: str, delay: float) -> Plan | None:
-            if delay:
-                await asyncio.sleep(delay)
-            return await handle_account(aid)
-
-        for idx, account_id in enumerate(accounts.ids):
-            tasks.append(
-                asyncio.create_task(start_after_delay(account_id, idx * pacing))
+    # Every account, and every confirmation phase, shares one IBKR session;
+    # it connects on first use and is closed once all accounts are done.
+    client = SharedIBKRClient(IBKRClient())
+    try:
+        # handle_account records its own failures, so no task raises here.
+        results = await asyncio.gather(
+            *(
+                handle_account(account_id, idx)
+                for idx, account_id in enumerate(accounts.ids)
             )
-            task_accounts.append(account_id)
-        results: list[Plan | Exception | None] = await asyncio.gather(
-            *tasks, return_exceptions=True
         )
-        for aid, res in zip(task_accounts, results):
-            if isinstance(res, Exception):
-                logging.error(
-                    "Unhandled error processing account %s", aid, exc_info=res
-                )
-                await _print_err(f"[red]{res}[/red]", output_lock)
-                failures.append((aid, str(res)))
-                capture_summary(
-                    report_dir,
-                    ts_dt,
-                    {
-                        "timestamp_run": ts_dt.isoformat(),
-                        "account_id": aid,
-                        "planned_orders": 0,
-                        "submitted": 0,
-                        "filled": 0,
-                        "rejected": 0,
-                        "buy_usd": 0.0,
-                        "sell_usd": 0.0,
-                        "pre_leverage": 0.0,
-                        "post_leverage": 0.0,
-                        "status": "failed",
-                        "error": str(res),
-                    },
-                )
-            elif res is not None:
-                plans.append(res)
-    else:
-        pacing = getattr(accounts, "pacing_sec", 0)
-        for idx, account_id in enumerate(accounts.ids):
-            plan = await handle_account(account_id)
-            if plan is not None:
-                plans.append(plan)
-            if idx < len(accounts.ids) - 1:
-                await asyncio.sleep(pacing)
-
-    if (
-        getattr(accounts, "parallel", False)
-        and confirm_mode is ConfirmMode.PER_ACCOUNT
-        and not args.yes
-    ):
-        pacing = getattr(accounts, "pacing_sec", 0)
-        for idx, plan in enumerate(plans):
-            account_id = plan["account_id"]
-            try:
-                await confirm_per_account(
-                    plan,
+        plans: list[Plan] = [plan for plan in results if plan is not None]
+
+        if parallel and confirm_mode is ConfirmMode.PER_ACCOUNT and not args.yes:
+            for idx, plan in enumerate(plans):
+                account_id = plan["account_id"]
+                try:
+                    await confirm_per_account(
+                        plan,
+                        args,
+                        cfg,
+                        ts_dt,
+                        client_factory=lambda: client,
+                        submit_batch=submit_batch,
+                        append_run_summary=capture_summary,
+                        write_post_trade_report=write_post_trade_report,
+                        compute_drift=compute_drift,
+                        prioritize_by_drift=prioritize_by_drift,
+                        size_orders=size_orders,
+                        output_lock=output_lock,
+                    )
+                except (ConfigError, IBKRError, PlanningError) as exc:
+                    logging.error("Error processing account %s: %s", account_id, exc)
+                    await _print_err(f"[red]{exc}[/red]", output_lock)
+                    failures.append((account_id, str(exc)))
+                    record_failure(account_id, plan, exc)
+                except Exception as exc:  # noqa: BLE001
+                    logging.exception(
+                        "Unexpected error processing account %s: %s", account_id, exc
+                    )
+                    await _print_err(f"[red]{exc}[/red]", output_lock)
+                    failures.append((account_id, str(exc)))
+                    record_failure(account_id, plan, exc)
+                finally:
+                    finish_account(account_id)
+                    if pacing_sec > 0 and idx < len(plans) - 1:
+                        await asyncio.sleep(pacing_sec)
+
+        if confirm_mode is ConfirmMode.GLOBAL:
+            plans.sort(key=lambda p: str(p["account_id"]))
+            failures.extend(
+                await confirm_global(
+                    plans,
                     args,
                     cfg,
                     ts_dt,
-                    client_factory=IBKRClient,
+                    client_factory=lambda: client,
                     submit_batch=submit_batch,
                     append_run_summary=capture_summary,
                     write_post_trade_report=write_post_trade_report,
                     compute_drift=compute_drift,
                     prioritize_by_drift=prioritize_by_drift,
                     size_orders=size_orders,
-                    output_lock=output_lock,
-                )
-            except (ConfigError, IBKRError, PlanningError) as exc:
-                logging.error("Error processing account %s: %s", account_id, exc)
-                await _print_err(f"[red]{exc}[/red]", output_lock)
-                failures.append((account_id, str(exc)))
-                if not any(r.get("account_id") == account_id for r in summary_rows):
-                    capture_summary(
-                        report_dir,
-                        ts_dt,
-                        {
-                            "timestamp_run": ts_dt.isoformat(),
-                            "account_id": account_id,
-                            "planned_orders": plan["planned_orders"],
-                            "submitted": 0,
-                            "filled": 0,
-                            "rejected": 0,
-                            "buy_usd": plan["buy_usd"],
-                            "sell_usd": plan["sell_usd"],
-                            "pre_leverage": plan["pre_leverage"],
-                            "post_leverage": plan["pre_leverage"],
-                            "status": "failed",
-                            "error": str(exc),
-                        },
-                    )
-            except Exception as exc:  # noqa: BLE001
-                logging.exception(
-                    "Unexpected error processing account %s: %s", account_id, exc
+                    pacing_sec=pacing_sec,
+                    parallel_accounts=parallel,
                 )
-                await _print_err(f"[red]{exc}[/red]", output_lock)
-                failures.append((account_id, str(exc)))
-                if not any(r.get("account_id") == account_id for r in summary_rows):
-                    capture_summary(
-                        report_dir,
-                        ts_dt,
-                        {
-                            "timestamp_run": ts_dt.isoformat(),
-                            "account_id": account_id,
-                            "planned_orders": plan["planned_orders"],
-                            "submitted": 0,
-                            "filled": 0,
-                            "rejected": 0,
-                            "buy_usd": plan["buy_usd"],
-                            "sell_usd": plan["sell_usd"],
-                            "pre_leverage": plan["pre_leverage"],
-                            "post_leverage": plan["pre_leverage"],
-                            "status": "failed",
-                            "error": str(exc),
-                        },
-                    )
-            finally:
-                if idx < len(plans) - 1:
-                    await asyncio.sleep(pacing)
-
-    if confirm_mode is ConfirmMode.GLOBAL:
-        plans.sort(key=lambda p: str(p["account_id"]))
-        failures.extend(
-            await confirm_global(
-                plans,
-                args,
-                cfg,
-                ts_dt,
-                client_factory=IBKRClient,
-                submit_batch=submit_batch,
-                append_run_summary=capture_summary,
-                write_post_trade_report=write_post_trade_report,
-                compute_drift=compute_drift,
-                prioritize_by_drift=prioritize_by_drift,
-                size_orders=size_orders,
-                pacing_sec=getattr(accounts, "pacing_sec", 0),
-                parallel_accounts=getattr(accounts, "parallel", False),
             )
-        )
+    finally:
+        await client.close()
 
-    summary_rows.sort(key=lambda r: str(r.get("account_id", "")))
-    for row in summary_rows:
-        append_run_summary(report_dir, ts_dt, row)
+    for account_id in sorted(pending):
+        for row in pending[account_id]:
+            append_run_summary(report_dir, ts_dt, row)
+    close_run_summaries()
 
     if failures:
-        await _print_err("[red]One or more accounts failed:[/red]", output_lock)
-        for acct, msg in failures:
-            await _print_err(f"[red]- {acct}: {msg}[/red]", output_lock)
+        lines = ["[red]One or more accounts failed:[/red]"]
+        lines.extend(f"[red]- {acct}: {msg}[/red]" for acct, msg in failures)
+        await _print_err("\n".join(lines), output_lock)
     return failures
 
 
+def _run_event_loop(coro: Coroutine[Any, Any, T], use_uvloop: bool) -> T:
+    """Run ``coro`` to completion, on a uvloop event loop when requested.
+
+    uvloop is optional and POSIX-only; without it the stdlib loop is used.
+    """
+
+    if use_uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            logging.warning("uvloop is not installed; using the default event loop")
+        else:
+            if sys.version_info >= (3, 11):
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    return runner.run(coro)
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="IBKR ETF Rebalancer (scaffold)")
     parser.add_argument(
@@ -409,10 +391,15 @@ def main(argv: list[str] | None = None) -> None:
             "without --yes"
         ),
     )
+    parser.add_argument(
+        "--uvloop",
+        action="store_true",
+        help="Run on the uvloop event loop if installed (POSIX only)",
+    )
     args = parser.parse_args(argv if argv is not None else [])
 
     try:
-        failures = asyncio.run(_run(args))
+        failures = _run_event_loop(_run(args), args.uvloop)
         if failures:
             raise SystemExit(1)
     except KeyboardInterrupt:
@@ -2,8 +2,33 @@ from pathlib import Path
 
 import pytest
 
+import src.io.portfolio_csv as portfolio_csv
+from src.io import clear_config_cache, reporting
+
 
 @pytest.fixture
 def portfolios_csv_path() -> Path:
     """Path to the default portfolios CSV used in tests."""
     return Path(__file__).resolve().parent.parent / "config" / "portfolios.csv"
+
+
+@pytest.fixture(autouse=True)
+def _reset_symbol_validation(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """Start every test with empty in-memory and on-disk symbol caches."""
+    monkeypatch.setattr(portfolio_csv, "_VALIDATED", set())
+    monkeypatch.setenv("IB_SIMPLE_CACHE_DIR", str(tmp_path / "ib_simple_cache"))
+    monkeypatch.delenv("IB_SIMPLE_VALIDATION_TTL", raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _close_run_summaries():
+    """Release run summary file handles kept open between appends."""
+    yield
+    reporting.close_run_summaries()
+
+
+@pytest.fixture(autouse=True)
+def _clear_parse_caches():
+    """Parse config and portfolio files afresh in every test."""
+    clear_config_cache()
+    portfolio_csv.clear_parse_cache()
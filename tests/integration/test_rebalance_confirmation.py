@@ -47,8 +47,8 @@ class DummyIBKRClient:
         }
 
 
-async def fake_fetch_price(ib, symbol, cfg):  # noqa: ARG001
-    return symbol, 100.0
+async def fake_fetch_prices(ib, symbols, cfg):  # noqa: ARG001
+    return {symbol: 100.0 for symbol in symbols}
 
 
 async def fake_validate_symbols(symbols, host, port, client_id):  # noqa: ARG001, D401
@@ -63,7 +63,7 @@ def test_prompt_default(
     """Default execution prompts and aborts when the user declines."""
 
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     async def fake_prompt(prompt: str) -> str:  # pragma: no cover - trivial
@@ -95,7 +95,7 @@ def test_yes_skips_prompt(
     """The --yes flag suppresses the prompt and proceeds."""
 
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     async def fail_prompt(
@@ -142,7 +142,7 @@ def test_prompt_global(
     """Global confirmation prompts once for all accounts."""
 
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     prompts: list[str] = []
@@ -178,7 +178,7 @@ def test_yes_skips_prompt_global(
     """--yes skips the global confirmation prompt."""
 
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     async def fail_prompt(
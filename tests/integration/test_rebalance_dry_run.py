@@ -45,8 +45,8 @@ class DummyIBKRClient:
         }
 
 
-async def fake_fetch_price(ib, symbol, cfg):  # noqa: ARG001
-    return symbol, 100.0
+async def fake_fetch_prices(ib, symbols, cfg):  # noqa: ARG001
+    return {symbol: 100.0 for symbol in symbols}
 
 
 async def fake_validate_symbols(symbols, host, port, client_id):  # noqa: ARG001, D401
@@ -55,7 +55,7 @@ async def fake_validate_symbols(symbols, host, port, client_id):  # noqa: ARG001
 
 def test_rebalance_dry_run(monkeypatch, capsys, portfolios_csv_path):
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     args = Namespace(
@@ -77,7 +77,7 @@ def test_rebalance_dry_run(monkeypatch, capsys, portfolios_csv_path):
 
 def test_rebalance_multiple_accounts_failure(monkeypatch, capsys, portfolios_csv_path):
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     original_load_config = rebalance.load_config
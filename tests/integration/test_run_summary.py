@@ -43,8 +43,8 @@ class DummyIBKRClient:
         }
 
 
-async def fake_fetch_price(ib, symbol, cfg):  # noqa: ARG001
-    return symbol, 100.0
+async def fake_fetch_prices(ib, symbols, cfg):  # noqa: ARG001
+    return {symbol: 100.0 for symbol in symbols}
 
 
 async def fake_validate_symbols(symbols, host, port, client_id):  # noqa: ARG001
@@ -53,7 +53,7 @@ async def fake_validate_symbols(symbols, host, port, client_id):  # noqa: ARG001
 
 def test_run_summary(tmp_path, monkeypatch, portfolios_csv_path):
     monkeypatch.setattr(rebalance, "IBKRClient", DummyIBKRClient)
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(portfolio_csv, "validate_symbols", fake_validate_symbols)
 
     original_load_config = rebalance.load_config
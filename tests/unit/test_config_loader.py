@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -231,6 +232,19 @@ def test_accounts_pacing_sec_negative(tmp_path: Path) -> None:
         load_config(path)
 
 
+def test_load_config_cached_until_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "settings.ini"
+    path.write_text(VALID_CONFIG)
+    first = load_config(path)
+    first.accounts.ids.append("MUTATED")
+    second = load_config(path)
+    assert second.accounts.ids == ["ACC1", "ACC2"]
+
+    path.write_text(VALID_CONFIG.replace("ids = ACC1, ACC2", "ids = ACC3"))
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert load_config(path).accounts.ids == ["ACC3"]
+
+
 def test_accounts_ids_trim_and_deduplicate(tmp_path: Path) -> None:
     content = VALID_CONFIG.replace(
         "ids = ACC1, ACC2",
@@ -253,6 +267,35 @@ def test_accounts_parallel_flag(tmp_path: Path) -> None:
     assert cfg.accounts.parallel is True
 
 
+def test_accounts_max_in_flight(tmp_path: Path) -> None:
+    content = VALID_CONFIG.replace(
+        "ids = ACC1, ACC2",
+        "ids = ACC1, ACC2\nmax_in_flight = 2",
+    )
+    path = tmp_path / "settings.ini"
+    path.write_text(content)
+    assert load_config(path).accounts.max_in_flight == 2
+    path.write_text(content.replace("max_in_flight = 2", "max_in_flight = 0"))
+    with pytest.raises(ConfigError):
+        load_config(path)
+
+
+def test_pricing_max_concurrency(tmp_path: Path) -> None:
+    path = tmp_path / "settings.ini"
+    path.write_text(VALID_CONFIG)
+    assert load_config(path).pricing.max_concurrency == 8
+    content = VALID_CONFIG.replace(
+        "fallback_to_snapshot = true\n",
+        "fallback_to_snapshot = true\nmax_concurrency = 3\n",
+        1,
+    )
+    path.write_text(content)
+    assert load_config(path).pricing.max_concurrency == 3
+    path.write_text(content.replace("max_concurrency = 3", "max_concurrency = 0"))
+    with pytest.raises(ConfigError):
+        load_config(path)
+
+
 def test_single_account_id(tmp_path: Path) -> None:
     content = VALID_CONFIG.replace("ids = ACC1, ACC2", "ids =   acc1   ")
     path = tmp_path / "settings.ini"
@@ -394,3 +437,70 @@ def test_portfolio_override_unknown_account(tmp_path: Path) -> None:
     with pytest.raises(ConfigError) as exc:
         load_config(path)
     assert "ACC3" in str(exc.value)
+
+
+VALID_TOML = """\
+[ibkr]
+host = "127.0.0.1"
+port = 4002
+client_id = 42
+read_only = true
+
+[accounts]
+ids = ["ACC1", "ACC2"]
+
+[models]
+smurf = 0.50
+badass = 0.30
+gltr = 0.20
+
+[rebalance]
+trigger_mode = "per_holding"
+per_holding_band_bps = 50
+portfolio_total_band_bps = 100
+min_order_usd = 500
+cash_buffer_type = "pct"
+cash_buffer_pct = 0.01
+cash_buffer_abs = 0
+allow_fractional = false
+max_leverage = 1.50
+trading_hours = "rth"
+max_passes = 3
+
+[pricing]
+price_source = "last"
+fallback_to_snapshot = true
+
+[execution]
+order_type = "market"
+algo_preference = "adaptive"
+adaptive_priority = "normal"
+fallback_plain_market = true
+batch_orders = true
+commission_report_timeout = 5.0
+wait_before_fallback = 300
+
+[io]
+report_dir = "reports"
+log_level = "INFO"
+
+["account:acc1"]
+min_order_usd = 100
+"""
+
+
+def test_toml_config_matches_ini(tmp_path: Path, config_file: Path) -> None:
+    path = tmp_path / "settings.toml"
+    path.write_text(VALID_TOML)
+    cfg = load_config(path)
+    ini_cfg = load_config(config_file)
+    assert cfg.account_overrides["ACC1"].min_order_usd == 100
+    cfg.account_overrides = {}
+    assert cfg == ini_cfg
+
+
+def test_toml_nested_table_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "settings.toml"
+    path.write_text(VALID_TOML + "\n[io.extra]\nfoo = 1\n")
+    with pytest.raises(ConfigError, match="nested tables"):
+        load_config(path)
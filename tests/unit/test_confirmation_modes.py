@@ -107,3 +107,38 @@ def test_global_prompt_once_and_aborts(
     assert "Aborted by user." in captured
     assert len(records) == 2
     assert all(r["status"] == "aborted" for r in records)
+
+
+@pytest.mark.parametrize("mode", [ConfirmMode.PER_ACCOUNT, ConfirmMode.GLOBAL])
+def test_dry_run_skips_prompt_and_submission(
+    monkeypatch, tmp_path, portfolios_csv_path: Path, mode: ConfirmMode
+):
+    records: list[dict[str, str]] = []
+
+    def fake_append(report_dir, ts, row):  # noqa: ARG001
+        records.append(row)
+
+    _patch_common(monkeypatch, tmp_path)
+    monkeypatch.setattr(rebalance, "append_run_summary", fake_append)
+
+    async def fail_prompt(prompt: str) -> str:  # pragma: no cover - must not run
+        raise AssertionError("dry run prompted")
+
+    async def fail_submit(*a, **k):  # pragma: no cover - must not run
+        raise AssertionError("dry run submitted orders")
+
+    monkeypatch.setattr("src.core.confirmation._prompt_user", fail_prompt)
+    monkeypatch.setattr(rebalance, "submit_batch", fail_submit)
+
+    args = Namespace(
+        config="config/settings.ini",
+        csv=str(portfolios_csv_path),
+        dry_run=True,
+        yes=False,
+        read_only=False,
+        confirm_mode=mode.value,
+    )
+
+    assert asyncio.run(rebalance._run(args)) == []
+    assert len(records) == 2
+    assert all(r["status"] == "dry_run" for r in records)
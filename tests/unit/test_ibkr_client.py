@@ -10,12 +10,13 @@ sys.path.append(str(Path(__file__).resolve().parents[2]))
 import src.broker.ibkr_client as ibkr_client
 import src.broker.utils as broker_utils
 from src.broker.errors import IBKRError
-from src.broker.ibkr_client import IBKRClient
+from src.broker.ibkr_client import IBKRClient, SharedIBKRClient
 
 
 class FakeIBSnapshot:
     def __init__(self):
         self.cancel_called = False
+        self.subscribed: list[str] = []
         self.client = SimpleNamespace(reqAccountUpdates=self._cancel)
 
     def _cancel(self, subscribe, account):
@@ -50,6 +51,9 @@ class FakeIBSnapshot:
             ),
         ]
 
+    async def reqAccountUpdatesAsync(self, account):
+        self.subscribed.append(account)
+
     def portfolio(self):
         return [
             SimpleNamespace(
@@ -111,6 +115,7 @@ def test_snapshot_converts_cad_cash(monkeypatch):
     }
     symbols = {p["symbol"] for p in result["positions"]}
     assert "MSFT" not in symbols
+    assert fake_ib.subscribed == ["ACC"]
     assert fake_ib.cancel_called
 
 
@@ -151,6 +156,9 @@ class FailingIB:
     def __init__(self):
         self.calls = 0
 
+    def isConnected(self):
+        return False
+
     async def connectAsync(self, host, port, clientId):
         self.calls += 1
         raise RuntimeError("boom")
@@ -173,3 +181,77 @@ def test_connect_retry_exhaustion_message(monkeypatch):
     assert "connect to IBKR failed" in str(exc.value)
     assert failing_ib.calls == 3
     assert sleeps == [0.5, 1.0]
+
+
+def test_connect_skips_handshake_when_connected(monkeypatch):
+    failing_ib = FailingIB()
+    monkeypatch.setattr(failing_ib, "isConnected", lambda: True)
+    monkeypatch.setattr(ibkr_client, "IB", lambda: failing_ib)
+
+    asyncio.run(IBKRClient().connect("127.0.0.1", 4002, 1))
+    assert failing_ib.calls == 0
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls: list[str] = []
+        self._ib = object()
+
+    async def connect(self, host, port, client_id):
+        self.calls.append("connect")
+
+    async def disconnect(self, host, port, client_id):
+        self.calls.append("disconnect")
+
+
+def test_shared_client_connects_once():
+    inner = CountingClient()
+    shared = SharedIBKRClient(inner)
+
+    async def run():
+        await shared.connect("h", 1, 1)
+        await shared.disconnect("h", 1, 1)
+        shared._host, shared._port, shared._client_id = "h", 1, 1
+        async with shared:
+            pass
+        await shared.close()
+        await shared.close()
+
+    asyncio.run(run())
+    assert inner.calls == ["connect", "disconnect"]
+    assert shared._ib is inner._ib
+
+
+def test_shared_client_reconnects_on_new_params():
+    inner = CountingClient()
+    shared = SharedIBKRClient(inner)
+
+    async def run():
+        await shared.connect("h", 1, 1)
+        await shared.connect("h", 1, 2)
+        await shared.close()
+
+    asyncio.run(run())
+    assert inner.calls == ["connect", "disconnect", "connect", "disconnect"]
+
+
+def test_shared_client_serializes_snapshots():
+    active: list[str] = []
+    overlaps: list[tuple[str, ...]] = []
+
+    class SlowSnapshotClient(CountingClient):
+        async def snapshot(self, account_id):
+            active.append(account_id)
+            if len(active) > 1:
+                overlaps.append(tuple(active))
+            await asyncio.sleep(0)
+            active.remove(account_id)
+            return {"account": account_id}
+
+    shared = SharedIBKRClient(SlowSnapshotClient())
+
+    async def run():
+        return await asyncio.gather(shared.snapshot("A"), shared.snapshot("B"))
+
+    assert asyncio.run(run()) == [{"account": "A"}, {"account": "B"}]
+    assert overlaps == []
@@ -70,10 +70,10 @@ async def _run_rebalance(monkeypatch):
 
     monkeypatch.setattr(rebalance, "IBKRClient", lambda: FakeClient())
 
-    async def fake_fetch_price(ib, symbol, cfg):  # noqa: ARG001
-        return symbol, 10.0
+    async def fake_fetch_prices(ib, symbols, cfg):  # noqa: ARG001
+        return {symbol: 10.0 for symbol in symbols}
 
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(rebalance, "render_preview", lambda *a, **k: "TABLE")
     monkeypatch.setattr(rebalance, "setup_logging", lambda *a, **k: None)
     monkeypatch.setattr(
@@ -6,6 +6,7 @@ from types import SimpleNamespace
 from typing import cast
 
 from src.broker.ibkr_client import IBKRClient
+from src.core import planner
 from src.core.drift import Drift
 from src.core.planner import plan_account
 from src.io import AppConfig
@@ -39,7 +40,9 @@ def test_plan_account_fetches_only_needed_prices() -> None:
         SimpleNamespace(
             ibkr=SimpleNamespace(host="h", port=1, client_id=1),
             models=SimpleNamespace(smurf=1.0, badass=0.0, gltr=0.0),
-            pricing=SimpleNamespace(price_source="last", fallback_to_snapshot=True),
+            pricing=SimpleNamespace(
+                price_source="last", fallback_to_snapshot=True, max_concurrency=8
+            ),
             io=SimpleNamespace(report_dir="reports", log_level="INFO"),
         ),
     )
@@ -113,7 +116,9 @@ def test_plan_account_fetches_price_for_avg_cost_position() -> None:
         SimpleNamespace(
             ibkr=SimpleNamespace(host="h", port=1, client_id=1),
             models=SimpleNamespace(smurf=1.0, badass=0.0, gltr=0.0),
-            pricing=SimpleNamespace(price_source="last", fallback_to_snapshot=True),
+            pricing=SimpleNamespace(
+                price_source="last", fallback_to_snapshot=True, max_concurrency=8
+            ),
             io=SimpleNamespace(report_dir="reports", log_level="INFO"),
         ),
     )
@@ -151,3 +156,71 @@ def test_plan_account_fetches_price_for_avg_cost_position() -> None:
     )
 
     assert fetched == ["AAA"]
+
+
+def test_plan_account_batches_price_fetch(monkeypatch) -> None:
+    """The batched fetcher requests all missing prices in one call."""
+
+    class FakeClient(IBKRClient):
+        def __init__(self) -> None:  # pragma: no cover - simple stub
+            self._ib = object()
+
+        async def __aenter__(self) -> "FakeClient":  # pragma: no cover - simple stub
+            return self
+
+        async def __aexit__(
+            self, exc_type, exc, tb
+        ) -> None:  # pragma: no cover - simple stub
+            return None
+
+        async def snapshot(self, account_id, *_, **__):
+            return {"positions": [], "cash": 0.0, "net_liq": 0.0}
+
+    cfg = cast(
+        AppConfig,
+        SimpleNamespace(
+            ibkr=SimpleNamespace(host="h", port=1, client_id=1),
+            models=SimpleNamespace(smurf=1.0, badass=0.0, gltr=0.0),
+            pricing=SimpleNamespace(
+                price_source="last", fallback_to_snapshot=True, max_concurrency=8
+            ),
+            io=SimpleNamespace(report_dir="reports", log_level="INFO"),
+        ),
+    )
+
+    portfolios = {"AAA": {"smurf": 0.5}, "BBB": {"smurf": 0.5}}
+
+    batches: list[list[str]] = []
+
+    async def fake_get_prices(
+        ib, symbols, *, price_source, fallback_to_snapshot, max_concurrency
+    ):
+        assert max_concurrency == 8
+        batches.append(sorted(symbols))
+        return {sym: 1.0 for sym in symbols}
+
+    monkeypatch.setattr(planner, "get_prices", fake_get_prices)
+
+    def fake_compute_drift(account_id, current, targets, prices, net_liq, cfg):
+        return [
+            Drift("AAA", 0, 0, -1.0, -1.0, prices["AAA"], "BUY"),
+            Drift("BBB", 0, 0, -1.0, -1.0, prices["BBB"], "BUY"),
+        ]
+
+    asyncio.run(
+        plan_account(
+            "A",
+            portfolios,
+            cfg,
+            datetime.now(),
+            client_factory=FakeClient,
+            compute_drift=fake_compute_drift,
+            prioritize_by_drift=lambda account_id, drifts, cfg: drifts,
+            size_orders=lambda *args, **kwargs: ([], 0.0, 0.0),
+            fetch_prices=planner._fetch_prices,
+            render_preview=lambda *args, **kwargs: "",
+            write_pre_trade_report=lambda *args, **kwargs: None,
+        )
+    )
+
+    assert batches == [["AAA", "BBB"]]
@@ -36,7 +36,10 @@ def test_plan_account_refreshes_stale_prices(monkeypatch):
             ibkr=SimpleNamespace(host="h", port=1, client_id=1),
             models=SimpleNamespace(smurf=1.0, badass=0.0, gltr=0.0),
             pricing=SimpleNamespace(
-                price_source="last", fallback_to_snapshot=True, price_max_age_sec=30
+                price_source="last",
+                fallback_to_snapshot=True,
+                price_max_age_sec=30,
+                max_concurrency=8,
             ),
             io=SimpleNamespace(report_dir="reports", log_level="INFO"),
         ),
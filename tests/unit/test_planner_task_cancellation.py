@@ -54,7 +54,9 @@ def test_tasks_cancelled_on_unexpected_error() -> None:
         SimpleNamespace(
             ibkr=SimpleNamespace(host="h", port=1, client_id=1),
             models=SimpleNamespace(smurf=1.0, badass=0.0, gltr=0.0),
-            pricing=SimpleNamespace(price_source="last", fallback_to_snapshot=True),
+            pricing=SimpleNamespace(
+                price_source="last", fallback_to_snapshot=True, max_concurrency=8
+            ),
             io=SimpleNamespace(report_dir="reports", log_level="INFO"),
         ),
     )
@@ -1,4 +1,5 @@
 import asyncio
+import os
 import re
 import sys
 from pathlib import Path
@@ -217,3 +218,42 @@ CASH,50%,50%,100%
 
     result["acct1"]["CASH"]["smurf"] = 0.0
     assert result["acct2"]["CASH"]["smurf"] == 50.0
+
+
+def test_load_portfolios_map_reparses_only_changed_files(
+    tmp_path: Path, monkeypatch
+) -> None:
+    content = """ETF,SMURF,BADASS,GLTR
+BLOK,50%,50%,0%
+CASH,50%,50%,100%
+"""
+    path = tmp_path / "pf.csv"
+    path.write_text(content)
+
+    calls = 0
+    original_parse_csv = portfolio_csv._parse_csv
+
+    def fake_parse_csv(p, expected):
+        nonlocal calls
+        calls += 1
+        return original_parse_csv(p, expected)
+
+    monkeypatch.setattr(portfolio_csv, "_parse_csv", fake_parse_csv)
+
+    def load() -> dict[str, dict[str, dict[str, float]]]:
+        return asyncio.run(
+            portfolio_csv.load_portfolios_map(
+                {"acct1": path}, host="127.0.0.1", port=4001, client_id=1
+            )
+        )
+
+    first = load()
+    first["acct1"]["CASH"]["smurf"] = 0.0
+    assert load()["acct1"]["CASH"]["smurf"] == 50.0
+    assert calls == 1
+
+    changed = content.replace("BLOK,50%", "BLOK,40%").replace("CASH,50%", "CASH,60%")
+    path.write_text(changed)
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+    assert load()["acct1"]["BLOK"]["smurf"] == 40.0
+    assert calls == 2
@@ -7,7 +7,8 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-from src.core.pricing import PricingError, get_price
+from src.core.pricing import PricingError, get_price, get_prices
+from src.io import contract_cache
 
 
 class Ticker(SimpleNamespace):
@@ -280,3 +281,219 @@ def test_get_price_raises_when_contract_not_qualified(
 
     assert len(qualify_calls) == 1
     assert req_calls == []
+
+
+def test_get_prices_batches_requests(monkeypatch: pytest.MonkeyPatch) -> None:
+    """All symbols are qualified and priced in one request each."""
+
+    ib = SimpleNamespace()
+    qualify_calls: list = []
+    req_calls: list = []
+
+    async def fake_qualify(*contracts):
+        qualify_calls.append([c.symbol for c in contracts])
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_calls.append(([c.symbol for c in contracts], snapshot))
+        prices = {"AAA": 10.0, "BBB": 20.0}
+        return [Ticker(last=prices[c.symbol]) for c in contracts]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    prices = asyncio.run(
+        get_prices(ib, ["AAA", "BBB"], price_source="last", fallback_to_snapshot=True)
+    )
+
+    assert prices == {"AAA": 10.0, "BBB": 20.0}
+    assert qualify_calls == [["AAA", "BBB"]]
+    assert req_calls == [(["AAA", "BBB"], False)]
+
+
+def test_get_prices_limits_symbols_per_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """``max_concurrency`` caps how many tickers are requested at once."""
+
+    ib = SimpleNamespace()
+    req_calls: list = []
+
+    async def fake_qualify(*contracts):
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_calls.append([c.symbol for c in contracts])
+        return [Ticker(last=1.0) for _ in contracts]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    prices = asyncio.run(
+        get_prices(
+            ib,
+            ["AAA", "BBB", "CCC"],
+            price_source="last",
+            fallback_to_snapshot=False,
+            max_concurrency=2,
+        )
+    )
+
+    assert prices == {"AAA": 1.0, "BBB": 1.0, "CCC": 1.0}
+    assert req_calls == [["AAA", "BBB"], ["CCC"]]
+
+
+def test_get_prices_snapshot_only_for_missing(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only symbols without a live price are retried with a snapshot."""
+
+    ib = SimpleNamespace()
+    req_calls: list = []
+
+    async def fake_qualify(*contracts):
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_calls.append(([c.symbol for c in contracts], snapshot))
+        if snapshot:
+            return [Ticker(last=None, close=5.0) for _ in contracts]
+        return [
+            Ticker(last=10.0) if c.symbol == "AAA" else Ticker(last=None)
+            for c in contracts
+        ]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    prices = asyncio.run(
+        get_prices(ib, ["AAA", "BBB"], price_source="last", fallback_to_snapshot=True)
+    )
+
+    assert prices == {"AAA": 10.0, "BBB": 5.0}
+    assert req_calls == [(["AAA", "BBB"], False), (["BBB"], True)]
+
+
+def test_get_prices_raises_when_contract_not_qualified(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """PricingError names the symbol whose contract could not be qualified."""
+
+    ib = SimpleNamespace()
+    req_calls: list = []
+
+    async def fake_qualify(*contracts):
+        return [c if c.symbol != "BAD" else None for c in contracts]
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_calls.append(contracts)
+        return [Ticker(last=1.0) for _ in contracts]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    with pytest.raises(PricingError, match="BAD"):
+        asyncio.run(
+            get_prices(
+                ib, ["AAA", "BAD"], price_source="last", fallback_to_snapshot=True
+            )
+        )
+
+    assert req_calls == []
+
+
+def test_get_prices_reuses_cached_contract_ids(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Symbols qualified once are not qualified again on later calls."""
+
+    ib = SimpleNamespace()
+    qualify_calls: list = []
+    req_con_ids: list = []
+    con_ids = {"AAA": 101, "BBB": 202}
+
+    async def fake_qualify(*contracts):
+        qualify_calls.append([c.symbol for c in contracts])
+        for c in contracts:
+            c.conId = con_ids[c.symbol]
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_con_ids.append([c.conId for c in contracts])
+        return [Ticker(last=10.0) for _ in contracts]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    def fetch(symbols):
+        return asyncio.run(
+            get_prices(ib, symbols, price_source="last", fallback_to_snapshot=False)
+        )
+
+    fetch(["AAA"])
+    assert fetch(["AAA", "BBB"]) == {"AAA": 10.0, "BBB": 10.0}
+    assert qualify_calls == [["AAA"], ["BBB"]]
+    assert req_con_ids == [[101], [101, 202]]
+    assert contract_cache.load_cache() == con_ids
+
+
+def test_get_prices_matches_rewritten_symbols(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Qualified contracts are matched to the requested symbol by position."""
+
+    ib = SimpleNamespace()
+
+    async def fake_qualify(*contracts):
+        for c in contracts:
+            c.symbol = c.symbol.replace(".", " ")
+            c.conId = 7
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        return [Ticker(last=300.0) for _ in contracts]
+
+    monkeypatch.setattr(ib, "qualifyContractsAsync", fake_qualify, raising=False)
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    prices = asyncio.run(
+        get_prices(ib, ["BRK.B"], price_source="last", fallback_to_snapshot=False)
+    )
+
+    assert prices == {"BRK.B": 300.0}
+    assert contract_cache.load_cache() == {"BRK.B": 7}
+
+
+def test_get_prices_evicts_cached_id_without_price(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A cached contract id that yields no price is dropped from the cache."""
+
+    contract_cache.update_cache({"AAA": 101, "BBB": 202})
+    ib = SimpleNamespace()
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        return [Ticker(last=10.0 if c.conId == 101 else None) for c in contracts]
+
+    monkeypatch.setattr(ib, "reqTickersAsync", fake_req, raising=False)
+
+    with pytest.raises(PricingError, match="BBB"):
+        asyncio.run(
+            get_prices(
+                ib, ["AAA", "BBB"], price_source="last", fallback_to_snapshot=False
+            )
+        )
+
+    assert contract_cache.load_cache() == {"AAA": 101}
+
+
+def test_contract_cache_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    contract_cache.update_cache({"AAA": 101})
+    assert contract_cache.load_cache() == {"AAA": 101}
+
+    monkeypatch.setattr(contract_cache.time, "time", lambda: 1e12)
+    assert contract_cache.load_cache() == {}
+
+    monkeypatch.setenv("IB_SIMPLE_CONTRACT_TTL", "0")
+    contract_cache.update_cache({"BBB": 202})
+    assert contract_cache.load_cache() == {}
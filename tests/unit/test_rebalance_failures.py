@@ -1,5 +1,6 @@
 import argparse
 import asyncio
+import sys
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -40,7 +41,11 @@ def _setup(monkeypatch: pytest.MonkeyPatch):
             return {"positions": [], "cash": 0.0, "net_liq": 0.0}
 
     monkeypatch.setattr(rebalance, "IBKRClient", lambda: FakeClient())
-    monkeypatch.setattr(rebalance, "_fetch_price", lambda ib, sym, cfg: (sym, 0.0))
+
+    async def fake_fetch_prices(ib, symbols, cfg):  # noqa: ARG001
+        return {symbol: 0.0 for symbol in symbols}
+
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
     monkeypatch.setattr(rebalance, "size_orders", lambda *a, **k: ([], 0.0, 0.0))
     monkeypatch.setattr(rebalance, "render_preview", lambda *a, **k: "TABLE")
     monkeypatch.setattr(rebalance, "setup_logging", lambda *a, **k: None)
@@ -238,3 +243,110 @@ def test_parallel_sleep_exception_records_failure(
     assert rows["good"]["status"] == "dry_run"
     assert rows["bad"]["status"] == "failed"
     assert rows["bad"]["planned_orders"] == 0
+
+
+def test_run_shares_one_connection_across_accounts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    args = _setup(monkeypatch)
+    monkeypatch.setattr(rebalance, "compute_drift", lambda *a, **k: [])
+    calls: list[str] = []
+
+    class CountingClient:
+        def __init__(self):
+            self._ib = object()
+
+        async def connect(self, host, port, client_id):  # noqa: ARG002
+            calls.append("connect")
+
+        async def disconnect(self, host, port, client_id):  # noqa: ARG002
+            calls.append("disconnect")
+
+        async def snapshot(self, account_id, *_, **__):  # noqa: ARG002
+            return {"positions": [], "cash": 0.0, "net_liq": 0.0}
+
+    monkeypatch.setattr(rebalance, "IBKRClient", CountingClient)
+
+    failures = asyncio.run(rebalance._run(args))
+    assert failures == []
+    assert calls == ["connect", "disconnect"]
+
+
+def test_run_summary_rows_written_in_account_order(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    args = _setup(monkeypatch)
+    written: list[str] = []
+
+    def fake_append_run_summary(path, ts_dt, data):  # noqa: ARG001
+        written.append(data["account_id"])
+
+    monkeypatch.setattr(rebalance, "append_run_summary", fake_append_run_summary)
+
+    asyncio.run(rebalance._run(args))
+    assert written == ["bad", "good"]
+
+
+def test_run_summary_keeps_every_row_per_account(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    args = _setup(monkeypatch)
+    rebalance.load_config("cfg").accounts.confirm_mode = rebalance.ConfirmMode.GLOBAL
+    written: list[tuple[str, str]] = []
+
+    def fake_append_run_summary(path, ts_dt, data):  # noqa: ARG001
+        written.append((data["account_id"], data["status"]))
+
+    async def fake_confirm_global(plans, args, cfg, ts_dt, **kwargs):  # noqa: ARG001
+        # Sell and buy phases each record their own row.
+        for plan in plans:
+            for status in ("completed", "failed"):
+                kwargs["append_run_summary"](
+                    Path("reports"),
+                    ts_dt,
+                    {"account_id": plan["account_id"], "status": status},
+                )
+        return []
+
+    monkeypatch.setattr(rebalance, "append_run_summary", fake_append_run_summary)
+    monkeypatch.setattr(rebalance, "confirm_global", fake_confirm_global)
+
+    asyncio.run(rebalance._run(args))
+    assert written == [
+        ("bad", "failed"),
+        ("good", "completed"),
+        ("good", "failed"),
+    ]
+
+
+def test_uvloop_flag_falls_back_without_uvloop(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    async def work() -> str:
+        return "done"
+
+    assert rebalance._run_event_loop(work(), use_uvloop=True) == "done"
+
+
+def test_serial_pacing_pauses_after_previous_account(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    args = _setup(monkeypatch)
+    rebalance.load_config("cfg").accounts.pacing_sec = 1.0
+    events: list[tuple[str, object]] = []
+    real_sleep = asyncio.sleep
+
+    def fake_compute_drift(account_id, *a, **k):  # noqa: ARG001
+        events.append(("plan", account_id))
+        return []
+
+    async def fake_sleep(duration):
+        events.append(("sleep", duration))
+        await real_sleep(0)
+
+    monkeypatch.setattr(rebalance, "compute_drift", fake_compute_drift)
+    monkeypatch.setattr(rebalance.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(rebalance, "append_run_summary", lambda *a: None)
+
+    asyncio.run(rebalance._run(args))
+    assert events == [("plan", "good"), ("sleep", 1.0), ("plan", "bad")]
@@ -14,14 +14,16 @@ from src.core.pricing import PricingError
 
 
 def _setup_common(
-    monkeypatch: pytest.MonkeyPatch,
+    monkeypatch: pytest.MonkeyPatch, ib: object | None = None
 ) -> tuple[dict[str, float], list[str], dict[str, float]]:
     """Prepare common patches and capture pricing information."""
 
     cfg = SimpleNamespace(
         ibkr=SimpleNamespace(host="h", port=1, client_id=1),
         models=SimpleNamespace(smurf=0.5, badass=0.3, gltr=0.2),
-        pricing=SimpleNamespace(price_source="last", fallback_to_snapshot=True),
+        pricing=SimpleNamespace(
+            price_source="last", fallback_to_snapshot=True, max_concurrency=8
+        ),
         execution=SimpleNamespace(
             order_type="MKT",
             algo_preference="adaptive",
@@ -43,7 +45,7 @@ def _setup_common(
 
     class FakeClient:
         def __init__(self) -> None:
-            self._ib = object()
+            self._ib = ib if ib is not None else object()
 
         async def connect(self, host, port, client_id):  # pragma: no cover - trivial
             return None
@@ -95,11 +97,11 @@ def test_run_fetches_prices_for_targets_and_trades(
 ) -> None:
     pre, fetched, sizing = _setup_common(monkeypatch)
 
-    async def fake_fetch_price(ib, symbol, cfg):
-        fetched.append(symbol)
-        return symbol, {"AAA": 15.0, "BBB": 20.0}[symbol]
+    async def fake_fetch_prices(ib, symbols, cfg):
+        fetched.extend(symbols)
+        return {symbol: {"AAA": 15.0, "BBB": 20.0}[symbol] for symbol in symbols}
 
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
 
     args = argparse.Namespace(
         config="cfg",
@@ -121,11 +123,11 @@ def test_run_aborts_when_trade_price_unavailable(
 ) -> None:
     pre, fetched, sizing = _setup_common(monkeypatch)
 
-    async def fake_fetch_price(ib, symbol, cfg):
-        fetched.append(symbol)
+    async def fake_fetch_prices(ib, symbols, cfg):
+        fetched.extend(symbols)
         raise PricingError("bad price")
 
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
 
     args = argparse.Namespace(
         config="cfg",
@@ -141,3 +143,36 @@ def test_run_aborts_when_trade_price_unavailable(
     assert pre == {}
     assert sorted(fetched) == ["AAA", "BBB"]
     assert sizing == {}
+
+
+def test_run_prices_through_get_prices(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The default batched fetcher prices every symbol via ``get_prices``."""
+
+    req_calls: list[list[str]] = []
+
+    async def fake_qualify(*contracts):
+        return list(contracts)
+
+    async def fake_req(*contracts, snapshot: bool = False):
+        req_calls.append([c.symbol for c in contracts])
+        return [
+            SimpleNamespace(last={"AAA": 15.0, "BBB": 20.0}[c.symbol])
+            for c in contracts
+        ]
+
+    ib = SimpleNamespace(qualifyContractsAsync=fake_qualify, reqTickersAsync=fake_req)
+    pre, _fetched, sizing = _setup_common(monkeypatch, ib)
+
+    args = argparse.Namespace(
+        config="cfg",
+        csv="csv",
+        dry_run=True,
+        yes=False,
+        read_only=False,
+    )
+    asyncio.run(rebalance._run(args))
+
+    assert pre == {"AAA": 15.0, "BBB": 20.0}
+    assert sizing == {"AAA": 15.0}
+    assert len(req_calls) == 1
+    assert sorted(req_calls[0]) == ["AAA", "BBB"]
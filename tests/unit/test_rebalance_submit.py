@@ -53,10 +53,10 @@ def _setup_common(monkeypatch: pytest.MonkeyPatch):
 
     monkeypatch.setattr(rebalance, "IBKRClient", lambda: FakeClient())
 
-    async def fake_fetch_price(ib, symbol, cfg):
-        return symbol, 10.0
+    async def fake_fetch_prices(ib, symbols, cfg):
+        return {symbol: 10.0 for symbol in symbols}
 
-    monkeypatch.setattr(rebalance, "_fetch_price", fake_fetch_price)
+    monkeypatch.setattr(rebalance, "_fetch_prices", fake_fetch_prices)
 
     monkeypatch.setattr(rebalance, "compute_drift", lambda *a, **k: [])
     monkeypatch.setattr(
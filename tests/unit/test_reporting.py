@@ -1,5 +1,6 @@
 import csv
 import logging
+import logging.handlers
 from datetime import datetime
 from types import SimpleNamespace
 
@@ -7,8 +8,11 @@ import pytest
 
 from src.core.drift import Drift
 from src.core.sizing import SizedTrade
+from src.io import reporting
 from src.io.reporting import (
     append_run_summary,
+    close_run_summaries,
+    setup_logging,
     write_post_trade_report,
     write_pre_trade_report,
 )
@@ -174,6 +178,20 @@ def test_write_pre_and_post_trade_reports(tmp_path, caplog):
     assert f"Post-trade report written to {post_path}" in messages
 
 
+def test_pre_trade_report_replaces_existing_file(tmp_path):
+    ts = datetime(2023, 1, 1)
+    drift = Drift("AAA", 60.0, 50.0, -10.0, -1000.0, 100.0, "BUY")
+    args = (tmp_path, ts, "ACCT", [drift], [], {"AAA": 100.0}, 1.0, 0.0, 0.0)
+
+    first = write_pre_trade_report(*args, 0.0, 0.0, _cfg())
+    second = write_pre_trade_report(*args, 0.0, 0.0, _cfg())
+
+    assert first == second
+    assert [p.name for p in tmp_path.iterdir()] == [first.name]
+    with second.open() as f:
+        assert [r["symbol"] for r in csv.DictReader(f)] == ["AAA"]
+
+
 def test_append_run_summary(tmp_path):
     ts = datetime(2023, 1, 1, 12, 0, 0)
     row1 = {
@@ -222,6 +240,33 @@ def test_append_run_summary(tmp_path):
     assert rows == expected_rows
 
 
+def test_append_run_summary_after_close(tmp_path):
+    ts = datetime(2023, 1, 1, 12, 0, 0)
+    row = {
+        "timestamp_run": ts.isoformat(),
+        "account_id": "ACC1",
+        "planned_orders": 1,
+        "submitted": 0,
+        "filled": 0,
+        "rejected": 0,
+        "buy_usd": 0.0,
+        "sell_usd": 0.0,
+        "pre_leverage": 0.5,
+        "post_leverage": 0.5,
+        "status": "aborted",
+        "error": "",
+    }
+
+    append_run_summary(tmp_path, ts, row)
+    close_run_summaries()
+    path = append_run_summary(tmp_path, ts, {**row, "account_id": "ACC2"})
+    close_run_summaries()
+
+    with path.open() as f:
+        rows = list(csv.DictReader(f))
+    assert [r["account_id"] for r in rows] == ["ACC1", "ACC2"]
+
+
 def test_post_trade_missing_execid_notes(tmp_path):
     ts = datetime(2023, 1, 1)
     drift = Drift("AAA", 60.0, 50.0, -10.0, -1000.0, 100.0, "BUY")
@@ -312,3 +357,65 @@ def test_post_trade_report_aggregates_multiple_passes(tmp_path):
     avg_price = (5.0 * 101.0 + 3.0 * 102.0) / 8.0
     assert float(row["fill_price"]) == pytest.approx(avg_price)
     assert float(row["commission"]) == pytest.approx(0.8)
+
+
+def test_setup_logging_writes_from_background_listener(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "_log_handlers", {})
+    monkeypatch.setattr(reporting, "_log_listeners", {})
+    monkeypatch.setattr(reporting, "_previous_root_level", None)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    before = list(root.handlers)
+    monkeypatch.setattr(root, "level", logging.WARNING)
+    ts = datetime(2023, 1, 1)
+    try:
+        path = setup_logging(tmp_path, "INFO", ts)
+        assert setup_logging(tmp_path, "DEBUG", ts) == path
+        added = [h for h in root.handlers if h not in before]
+        assert len(added) == 1
+        assert isinstance(added[0], logging.handlers.QueueHandler)
+        assert root.level == logging.DEBUG
+
+        logging.getLogger("ib_simple.test").info("queued")
+        reporting.stop_log_listeners()
+        assert root.handlers == before
+        assert root.level == logging.WARNING
+        assert "INFO ib_simple.test: queued" in path.read_text()
+    finally:
+        reporting.stop_log_listeners()
+
+
+def test_setup_logging_replaces_previous_log_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "_log_handlers", {})
+    monkeypatch.setattr(reporting, "_log_listeners", {})
+    monkeypatch.setattr(reporting, "_previous_root_level", None)
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    before = list(root.handlers)
+    monkeypatch.setattr(root, "level", root.level)
+    try:
+        first = setup_logging(tmp_path, "INFO", "run1")
+        second = setup_logging(tmp_path, "INFO", "run2")
+        assert len([h for h in root.handlers if h not in before]) == 1
+
+        logging.getLogger("ib_simple.test").info("second run")
+        reporting.stop_log_listeners()
+        assert "second run" not in first.read_text()
+        assert "second run" in second.read_text()
+    finally:
+        reporting.stop_log_listeners()
+
+
+def test_setup_logging_leaves_configured_root_alone(tmp_path, monkeypatch):
+    monkeypatch.setattr(reporting, "_log_handlers", {})
+    monkeypatch.setattr(reporting, "_log_listeners", {})
+    root = logging.getLogger()
+    existing = logging.NullHandler()
+    monkeypatch.setattr(root, "handlers", [existing])
+    monkeypatch.setattr(root, "level", logging.WARNING)
+
+    path = setup_logging(tmp_path, "DEBUG", "run")
+
+    assert root.handlers == [existing]
+    assert root.level == logging.WARNING
+    assert not path.exists()
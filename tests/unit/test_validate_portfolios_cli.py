@@ -7,6 +7,7 @@ import pytest
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
+import src.io.portfolio_csv as portfolio_csv
 import src.io.validate_portfolios as validate_portfolios
 from tests.unit.test_config_loader import VALID_CONFIG
 
@@ -158,15 +159,13 @@ path = acc1.csv
 
     seen: dict[str, Path] = {}
 
-    orig = validate_portfolios.load_portfolios_map
+    orig = portfolio_csv.load_portfolios_map
 
     async def fake_load_portfolios_map(paths, *, host, port, client_id):  # noqa: ARG001
         seen.update({k: Path(v).resolve() for k, v in paths.items()})
         return await orig(paths, host=host, port=port, client_id=client_id)
 
-    monkeypatch.setattr(
-        validate_portfolios, "load_portfolios_map", fake_load_portfolios_map
-    )
+    monkeypatch.setattr(portfolio_csv, "load_portfolios_map", fake_load_portfolios_map)
 
     other_dir = tmp_path / "other"
     other_dir.mkdir()
@@ -206,7 +205,7 @@ def test_uses_accounts_path_from_config(
         seen.append(Path(path).resolve())
         return {}
 
-    monkeypatch.setattr(validate_portfolios, "load_portfolios", fake_load_portfolios)
+    monkeypatch.setattr(portfolio_csv, "load_portfolios", fake_load_portfolios)
 
     asyncio.run(validate_portfolios.main(config_path=str(cfg_path)))
 
@@ -8,6 +8,7 @@ from ib_async.contract import ContractDetails, Stock
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 import src.io.portfolio_csv as portfolio_csv
+from src.io import json_cache
 from src.io.portfolio_csv import PortfolioCSVError
 
 
@@ -111,3 +112,112 @@ def test_connection_failure(monkeypatch) -> None:
     assert "IB connection failed: boom" in str(excinfo.value)
     assert ib.calls == []
     assert ib.disconnects == 1
+
+
+def test_validated_symbols_are_cached(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    for _ in range(2):
+        asyncio.run(
+            portfolio_csv.validate_symbols(
+                ["BLOK", "SPY"], host="127.0.0.1", port=4001, client_id=1
+            )
+        )
+    assert ib.calls == ["BLOK", "SPY"]
+    assert ib.disconnects == 1
+
+
+def test_failed_validation_not_cached(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    for _ in range(2):
+        with pytest.raises(PortfolioCSVError):
+            asyncio.run(
+                portfolio_csv.validate_symbols(
+                    ["BLOK", "BAD"], host="127.0.0.1", port=4001, client_id=1
+                )
+            )
+    assert ib.calls == ["BLOK", "BAD", "BLOK", "BAD"]
+
+
+def test_validation_cache_persists_across_processes(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    asyncio.run(
+        portfolio_csv.validate_symbols(
+            ["BLOK", "SPY"], host="127.0.0.1", port=4001, client_id=1
+        )
+    )
+    # Simulate a new process: the in-memory set is empty, the file remains.
+    monkeypatch.setattr(portfolio_csv, "_VALIDATED", set())
+    asyncio.run(
+        portfolio_csv.validate_symbols(
+            ["BLOK", "SPY"], host="127.0.0.1", port=4001, client_id=1
+        )
+    )
+    assert ib.calls == ["BLOK", "SPY"]
+    assert ib.disconnects == 1
+
+
+def test_validation_cache_disabled_with_zero_ttl(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    monkeypatch.setenv("IB_SIMPLE_VALIDATION_TTL", "0")
+    for _ in range(2):
+        monkeypatch.setattr(portfolio_csv, "_VALIDATED", set())
+        asyncio.run(
+            portfolio_csv.validate_symbols(
+                ["SPY"], host="127.0.0.1", port=4001, client_id=1
+            )
+        )
+    assert ib.calls == ["SPY", "SPY"]
+    assert not json_cache.cache_path(portfolio_csv._VALIDATION_CACHE_FILE).exists()
+
+
+def test_no_ib_client_when_nothing_to_check(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    asyncio.run(
+        portfolio_csv.validate_symbols(
+            ["SPY"], host="127.0.0.1", port=4001, client_id=1
+        )
+    )
+
+    def fail() -> None:
+        raise AssertionError("IB() should not be constructed")
+
+    monkeypatch.setattr(portfolio_csv, "IB", fail)
+    for symbols in (["CASH"], ["SPY", "CASH"]):
+        asyncio.run(
+            portfolio_csv.validate_symbols(
+                symbols, host="127.0.0.1", port=4001, client_id=1
+            )
+        )
+    assert ib.calls == ["SPY"]
+
+
+def test_failed_lookup_cancels_pending_lookups(monkeypatch) -> None:
+    ib = setup_fake_ib(monkeypatch)
+    cancelled: list[str] = []
+
+    async def lookup(contract):
+        if contract.symbol == "BAD":
+            raise RuntimeError("lookup failed")
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.append(contract.symbol)
+            raise
+
+    cancelled_at_disconnect: list[str] = []
+    disconnect = ib.disconnect
+
+    def record_disconnect() -> None:
+        cancelled_at_disconnect.extend(cancelled)
+        disconnect()
+
+    setattr(ib, "reqContractDetailsAsync", lookup)
+    setattr(ib, "disconnect", record_disconnect)
+    with pytest.raises(RuntimeError, match="lookup failed"):
+        asyncio.run(
+            portfolio_csv.validate_symbols(
+                ["SPY", "BAD"], host="127.0.0.1", port=4001, client_id=1
+            )
+        )
+    assert cancelled_at_disconnect == ["SPY"]
+    assert ib.disconnects == 1